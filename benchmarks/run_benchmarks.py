@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""Benchmark suite for the timer's hot paths, with a baseline to compare against.
+
+Each case times one operation many times over and reports the median,
+mean and 99th percentile in microseconds:
+
+    python3 benchmarks/run_benchmarks.py --save-baseline baseline.json
+    python3 benchmarks/run_benchmarks.py --baseline baseline.json
+
+The second run exits with status 1 and names every case whose median got
+slower than the baseline by more than --tolerance (25% by default).
+--json writes the results as JSON, "-" for stdout.
+
+Cases marked as needing a display create Tk widgets. Without a display the
+suite re-runs itself under xvfb-run when that is installed, otherwise
+those cases are reported as skipped. Baselines are only meaningful on the
+machine that recorded them, so none is shipped.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from productivity_timer.checkpoint import SessionCheckpoint
+from productivity_timer.engine import TimerEngine
+from productivity_timer.manager import TimerManager
+from productivity_timer.notifier import NotificationDispatcher
+from productivity_timer.presets import Preset, PresetStore
+from productivity_timer.reminders import NotificationEntry, parse_reminder_spec
+from productivity_timer.simulation import VirtualClock, simulate
+from productivity_timer.status_file import StatusExport
+
+VERSION = 1
+XVFB_ENV = "PRODUCTIVITY_TIMER_BENCH_XVFB"
+CASES = []
+
+def case(name, display=False):
+    # Registers a function(scale) returning the durations of its operations
+    def register(function):
+        CASES.append((name, function, display))
+        return function
+    return register
+
+def timed(function, count):
+    durations = []
+    for index in range(count):
+        start = time.perf_counter()
+        function(index)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+def many_reminders(count):
+    # Spread over the period, a mix of percentages, offsets and repeats
+    reminders = []
+    for index in range(count):
+        if index % 10 == 8:
+            reminders.append(NotificationEntry(offset=index % 3600, message=f"Offset {index}"))
+        elif index % 10 == 9:
+            reminders.append(NotificationEntry(every=60 + index % 600, message=f"Every {index}"))
+        else:
+            reminders.append(NotificationEntry(index * 100 / count, f"Reminder {index}"))
+    return reminders
+
+def running_engine(reminders, **engine_args):
+    clock = VirtualClock()
+    engine = TimerEngine(3600, 900, clock=clock, wall_clock=clock.wall, **engine_args)
+    engine.set_reminders(reminders)
+    engine.start()
+    return engine, clock
+
+@case("engine_tick_10k_reminders")
+def bench_engine_tick(scale):
+    # One tick per second over a long session, reminders firing on the way
+    engine, clock = running_engine(many_reminders(int(10000 * scale)))
+    def tick(_):
+        clock.advance(engine.next_delay())
+        engine.tick()
+    return timed(tick, int(4 * 3600 * scale))
+
+@case("reminder_rebuild_10k")
+def bench_rebuild(scale):
+    reminders = many_reminders(int(10000 * scale))
+    engine, _ = running_engine(reminders)
+    return timed(lambda _: engine.set_reminders(reminders), 20)
+
+@case("simulate_week_100_reminders")
+def bench_simulate(scale):
+    reminders = many_reminders(100) + [parse_reminder_spec("@12:30:Lunch")]
+    return timed(lambda _: simulate(3600, 900, reminders, 7 * 86400 * scale), 3)
+
+@case("status_file_write_10k_reminders")
+def bench_status_file(scale):
+    engine, clock = running_engine(many_reminders(int(10000 * scale)))
+    with tempfile.TemporaryDirectory() as directory:
+        export = StatusExport(engine, os.path.join(directory, "status"))
+        def write(_):
+            clock.advance(1)
+            export("tick", {"is_work_period": True, "remaining": 100, "total": 3600,
+                            "progress": 50.0})
+        durations = timed(write, int(3600 * scale))
+        export.close()
+    return durations
+
+@case("checkpoint_snapshot_10k_reminders")
+def bench_checkpoint(scale):
+    engine, _ = running_engine(many_reminders(int(10000 * scale)))
+    checkpoint = SessionCheckpoint(engine, tempfile.gettempdir())
+    return timed(lambda _: checkpoint.snapshot(), 50)
+
+def presets_store(directory, reminders, presets=10):
+    store = PresetStore(directory)
+    for number in range(presets):
+        entries = [NotificationEntry(index * 100 / reminders, f"Reminder {index} of preset {number}")
+                   for index in range(reminders)]
+        store.put(f"Preset {number}", Preset("50", "10", entries))
+    return store
+
+@case("presets_save_10x500")
+def bench_presets_save(scale):
+    # Saving includes the fsync of the atomic write
+    with tempfile.TemporaryDirectory() as directory:
+        store = presets_store(directory, int(500 * scale))
+        return timed(lambda _: store.save(), 50)
+
+@case("presets_load_10x500")
+def bench_presets_load(scale):
+    with tempfile.TemporaryDirectory() as directory:
+        presets_store(directory, int(500 * scale)).save()
+        return timed(lambda _: PresetStore(directory).load(), 50)
+
+@case("manager_wakeup_1000_timers")
+def bench_manager(scale):
+    # Timers started at spread out moments within a second, so each wakeup
+    # ticks the few whose deadlines fall within the slack
+    clock = VirtualClock()
+    manager = TimerManager(clock=clock, wall_clock=clock.wall)
+    timers = int(1000 * scale)
+    for number in range(timers):
+        manager.add(f"timer-{number}", work_seconds=60, break_seconds=30,
+                    reminders=[NotificationEntry(50, "half way"),
+                               NotificationEntry(every=7, message="every 7s")])
+    for name in manager.names():
+        manager.start(name)
+        clock.advance(1 / timers)
+    def wakeup(_):
+        clock.advance(manager.next_delay())
+        manager.run_due()
+    return timed(wakeup, int(20000 * scale))
+
+@case("manager_cpu_per_second_1000_timers")
+def bench_manager_real_clock(scale):
+    # The same timers on the real clock, sleeping between deadlines. Each
+    # "operation" is one wall-clock second and its duration the CPU time
+    # used in it, which should stay flat however long the timers run.
+    manager = TimerManager()
+    timers = int(1000 * scale)
+    for number in range(timers):
+        manager.add(f"timer-{number}", work_seconds=60, break_seconds=30,
+                    reminders=[NotificationEntry(50, "half way"),
+                               NotificationEntry(every=7, message="every 7s")])
+    start = time.monotonic()
+    for index, name in enumerate(manager.names()):
+        time.sleep(max(0.0, start + index / timers - time.monotonic()))
+        manager.start(name)
+    durations = []
+    for _ in range(max(3, int(10 * scale))):
+        cpu = time.process_time()
+        manager.run(until=time.monotonic() + 1)
+        durations.append(time.process_time() - cpu)
+    for name in manager.names():
+        manager.stop(name)
+    return durations
+
+@case("notification_submit")
+def bench_submit(scale):
+    dispatcher = NotificationDispatcher(lambda message: None, lambda message: None,
+                                        maxsize=10 ** 9, coalesce_window=0)
+    return timed(lambda index: dispatcher.submit(f"Reminder {index}"), int(10000 * scale))
+
+@case("progress_bar_draw", display=True)
+def bench_progress_bar(scale, root):
+    from productivity_timer.widgets import CircularProgressBar
+    class CountingProgressBar(CircularProgressBar):
+        # Every create_* call on a Canvas goes through _create
+        created = 0
+        def _create(self, *args, **kwargs):
+            CountingProgressBar.created += 1
+            return super()._create(*args, **kwargs)
+    bar = CountingProgressBar(root, size=250)
+    bar.pack()
+    root.update()
+    created_at_start = CountingProgressBar.created
+    ticks = int(3600 * scale)
+    def draw(elapsed):
+        remaining = ticks - elapsed
+        bar.draw(elapsed / ticks * 100, f"{remaining // 60:02d}:{remaining % 60:02d}")
+        root.update_idletasks()
+    durations = timed(draw, ticks)
+    bar.destroy()
+    # Redraws update the items made up front, a timing with new ones is wrong
+    if CountingProgressBar.created != created_at_start:
+        raise RuntimeError(f"draw() created {CountingProgressBar.created - created_at_start} "
+                           f"canvas items, it should only update the existing ones")
+    return durations
+
+@case("shadow_label_create", display=True)
+def bench_shadow_label(scale, root):
+    from productivity_timer.widgets import ShadowLabel
+    def create(index):
+        label = ShadowLabel(root, f"Label {index % 20}", font=('Helvetica', 12), fg='white',
+                            bg='#121212', offset=(1, 1), shadow_color='black')
+        label.pack()
+        root.update_idletasks()
+        label.destroy()
+    return timed(create, int(500 * scale))
+
+@case("status_label_churn", display=True)
+def bench_status_churn(scale, root):
+    # _update_status sets a few repeating messages and the odd new one
+    from productivity_timer.widgets import ShadowLabel
+    label = ShadowLabel(root, "Ready", font=('Helvetica', 12), fg='white', bg='#121212',
+                        offset=(1, 1), shadow_color='black')
+    label.pack()
+    messages = ["Work in progress", "Break in progress", "Paused", "Stopped"]
+    def update(index):
+        if index % 50 == 0:
+            label.set_text(f"Imported {index} reminders")
+        else:
+            label.set_text(messages[index // 10 % len(messages)])
+        root.update_idletasks()
+    return timed(update, int(5000 * scale))
+
+def summarize(durations):
+    ordered = sorted(durations)
+    return {"ops": len(ordered),
+            "median_us": ordered[len(ordered) // 2] * 1e6,
+            "mean_us": sum(ordered) / len(ordered) * 1e6,
+            "p99_us": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1e6}
+
+def open_display():
+    # A Tk root, or None when there is no display to draw on
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return None
+    return root
+
+def run(names=None, scale=1.0):
+    results = {}
+    root = None
+    display_checked = False
+    for name, function, display in CASES:
+        if names and not any(part in name for part in names):
+            continue
+        print(f"running {name}...", file=sys.stderr)
+        if display:
+            if not display_checked:
+                root = open_display()
+                display_checked = True
+            if root is None:
+                results[name] = {"skipped": "no display"}
+                continue
+            results[name] = summarize(function(scale, root))
+        else:
+            results[name] = summarize(function(scale))
+    if root is not None:
+        root.destroy()
+    return {"version": VERSION, "python": platform.python_version(),
+            "platform": platform.platform(), "scale": scale, "results": results}
+
+def compare(report, baseline, tolerance):
+    # Lines describing every case slower than the baseline beyond tolerance
+    regressions = []
+    for name, result in report["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before or "median_us" not in before or "median_us" not in result:
+            continue
+        change = result["median_us"] / before["median_us"] - 1
+        if change > tolerance:
+            regressions.append(f"{name}: median {result['median_us']:.1f} us, baseline "
+                               f"{before['median_us']:.1f} us (+{change * 100:.0f}%)")
+    return regressions
+
+def format_table(report, baseline=None):
+    lines = [f"{'case':<36} {'ops':>7} {'median us':>11} {'p99 us':>11} {'vs base':>9}"]
+    for name, result in report["results"].items():
+        if "skipped" in result:
+            lines.append(f"{name:<36} skipped, {result['skipped']}")
+            continue
+        before = (baseline or {}).get("results", {}).get(name, {})
+        change = ""
+        if "median_us" in before:
+            change = f"{(result['median_us'] / before['median_us'] - 1) * 100:+.0f}%"
+        lines.append(f"{name:<36} {result['ops']:>7} {result['median_us']:>11.2f} "
+                     f"{result['p99_us']:>11.2f} {change:>9}")
+    return "\n".join(lines)
+
+def needs_xvfb(names):
+    if os.environ.get(XVFB_ENV) or not shutil.which("xvfb-run"):
+        return False
+    if not any(display and (not names or any(part in name for part in names))
+               for name, _, display in CASES):
+        return False
+    root = open_display()
+    if root is None:
+        return True
+    root.destroy()
+    return False
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", help="only run cases whose name contains one of these")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply every workload by this, e.g. 0.1 for a quick run")
+    parser.add_argument("--json", metavar="FILE", help="write the results as JSON, - for stdout")
+    parser.add_argument("--baseline", metavar="FILE", help="compare with a saved run")
+    parser.add_argument("--save-baseline", metavar="FILE", help="save this run as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline (default 0.25, 25%%)")
+    args = parser.parse_args(argv)
+
+    if needs_xvfb(args.cases):
+        # Same arguments, with a virtual display
+        env = dict(os.environ, **{XVFB_ENV: "1"})
+        command = ["xvfb-run", "-a", sys.executable, os.path.abspath(__file__)]
+        return subprocess.call(command + list(argv if argv is not None else sys.argv[1:]),
+                               env=env)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        # Workloads of another size are not comparable
+        if baseline.get("scale") != args.scale:
+            print(f"{args.baseline} was recorded with --scale {baseline.get('scale')}",
+                  file=sys.stderr)
+            return 2
+    report = run(args.cases, args.scale)
+    print(format_table(report, baseline), file=sys.stderr)
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=1)
+        sys.stdout.write("\n")
+    elif args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=1)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=1)
+    if baseline is not None:
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
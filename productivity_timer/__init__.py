@@ -0,0 +1,11 @@
+"""GUI-free core of the Productivity Timer.
+
+The Tk window lives in productivity_timer.app and is only imported by
+timer.py, so `python -m productivity_timer` runs the same engine in a
+terminal without loading Tk.
+"""
+from .engine import TimerEngine, format_time
+from .manager import TimerManager
+from .notifier import NotificationDispatcher
+from .reminders import NotificationEntry, ReminderQueue
+from .scheduler import TickScheduler
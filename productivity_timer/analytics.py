@@ -0,0 +1,179 @@
+"""Productivity statistics over the session journal, computed with NumPy.
+
+Journal entries are loaded into columnar arrays and reduced in vectorized
+form. Per-day totals are kept in an on-disk summary cache next to the
+journal, so a refresh only reads the lines written since the previous one,
+found by the byte position reached in the journal files.
+Days are counted in the current local UTC offset.
+"""
+import json
+import os
+import time
+
+# NumPy is optional, the stats panel says so when it is missing
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from .journal import read_journal_after
+from .storage import atomic_write
+
+CACHE_NAME = "analytics-cache.json"
+CACHE_VERSION = 2
+
+START, COMPLETE, STOP, REMIND = range(4)
+KINDS = {"start": START, "complete": COMPLETE, "stop": STOP, "remind": REMIND}
+
+# Upper edges, in seconds, of the reminder lateness histogram
+LATENESS_EDGES = [0.0, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, float("inf")]
+
+# Per-day columns kept in the cache
+FOCUS, STARTED, COMPLETED, STOPPED = range(4)
+
+def load_columns(entries):
+    """Turn journal entries into a dict of equally long NumPy arrays."""
+    t, kind, work, length, left, late = [], [], [], [], [], []
+    for entry in entries:
+        code = KINDS.get(entry.get("e"))
+        if code is None:
+            continue
+        t.append(entry["t"])
+        kind.append(code)
+        # Only period events carry a mode
+        work.append(entry.get("mode", "work") == "work")
+        length.append(entry.get("len", 0))
+        left.append(entry.get("left", 0))
+        late.append(entry.get("late", 0))
+    return {
+        "t": np.array(t, dtype=np.float64),
+        "kind": np.array(kind, dtype=np.int8),
+        "work": np.array(work, dtype=bool),
+        "len": np.array(length, dtype=np.float64),
+        "left": np.array(left, dtype=np.float64),
+        "late": np.array(late, dtype=np.float64),
+    }
+
+def summarize(columns, utc_offset=0, carry_len=0.0):
+    """Reduce a batch of journal columns to per-day totals.
+
+    carry_len is the length of a period that was started in an earlier
+    batch and is closed in this one. Returns (days, totals, lateness counts,
+    lateness values, new carry_len).
+    """
+    kind = columns["kind"]
+    work = columns["work"]
+    index = np.arange(len(kind))
+    # Length of the period each row belongs to: the latest start at or before it
+    last_start = np.maximum.accumulate(np.where(kind == START, index, -1))
+    length = np.where(last_start >= 0, columns["len"][np.maximum(last_start, 0)], carry_len)
+
+    completed = (kind == COMPLETE) & work
+    stopped = (kind == STOP) & work
+    focus = np.where(completed, length, 0.0)
+    focus += np.where(stopped, np.clip(length - columns["left"], 0, None), 0.0)
+
+    day = np.floor((columns["t"] + utc_offset) / 86400).astype(np.int64)
+    days, inverse = np.unique(day, return_inverse=True)
+    totals = np.zeros((len(days), 4))
+    totals[:, FOCUS] = np.bincount(inverse, weights=focus, minlength=len(days))
+    totals[:, STARTED] = np.bincount(inverse, weights=(kind == START) & work, minlength=len(days))
+    totals[:, COMPLETED] = np.bincount(inverse, weights=completed, minlength=len(days))
+    totals[:, STOPPED] = np.bincount(inverse, weights=stopped, minlength=len(days))
+
+    late = columns["late"][kind == REMIND]
+    late_counts = np.histogram(np.clip(late, 0, None), bins=LATENESS_EDGES)[0]
+
+    # A start with no complete/stop after it stays open for the next batch
+    closes = np.flatnonzero((kind == COMPLETE) | (kind == STOP))
+    starts = np.flatnonzero(kind == START)
+    if len(starts) and (not len(closes) or starts[-1] > closes[-1]):
+        carry_len = float(columns["len"][starts[-1]])
+    elif len(closes):
+        carry_len = 0.0
+    return days, totals, late_counts, late, carry_len
+
+class StatsCache:
+    """Incremental summary of the journal in `directory`."""
+    def __init__(self, directory, utc_offset=None):
+        self.directory = directory
+        self.path = os.path.join(directory, CACHE_NAME)
+        self.utc_offset = time.localtime().tm_gmtoff if utc_offset is None else utc_offset
+        self.state = self._load()
+
+    def _empty(self):
+        return {"version": CACHE_VERSION, "utc_offset": self.utc_offset, "cursor": None,
+                "carry_len": 0.0, "days": {}, "late_counts": [0] * (len(LATENESS_EDGES) - 1),
+                "late_max": 0.0}
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                state = json.load(handle)
+        except (OSError, ValueError):
+            return self._empty()
+        if state.get("version") != CACHE_VERSION or state.get("utc_offset") != self.utc_offset:
+            return self._empty()
+        return state
+
+    def _save(self):
+        atomic_write(self.path, json.dumps(self.state, separators=(",", ":")).encode("utf-8"))
+
+    def update(self):
+        """Fold journal entries newer than the cache into it, then save it."""
+        entries, cursor = read_journal_after(self.directory, self.state["cursor"])
+        if cursor == self.state["cursor"]:
+            return self
+        self.state["cursor"] = cursor
+        columns = load_columns(entries)
+        if not len(columns["t"]):
+            self._save()
+            return self
+        days, totals, late_counts, late, carry_len = summarize(
+            columns, self.utc_offset, self.state["carry_len"])
+        cached_days = self.state["days"]
+        for day, row in zip(days.tolist(), totals.tolist()):
+            previous = cached_days.get(str(day), [0.0, 0, 0, 0])
+            cached_days[str(day)] = [a + b for a, b in zip(previous, row)]
+        self.state["late_counts"] = (np.array(self.state["late_counts"]) + late_counts).tolist()
+        if len(late):
+            self.state["late_max"] = max(self.state["late_max"], float(late.max()))
+        self.state["carry_len"] = carry_len
+        self._save()
+        return self
+
+    def report(self, now=None):
+        """Aggregates for the stats panel, as a plain dict."""
+        now = time.time() if now is None else now
+        today = int((now + self.utc_offset) // 86400)
+        cached_days = self.state["days"]
+        days = np.array([int(day) for day in cached_days], dtype=np.int64)
+        totals = np.array(list(cached_days.values()), dtype=np.float64).reshape(-1, 4)
+        # Weeks start on Monday, and day 0 (1970-01-01) was a Thursday
+        this_week = (days + 3) // 7 == (today + 3) // 7
+        started = totals[:, STARTED].sum()
+        worked = totals[:, STARTED] > 0
+        late_counts = np.array(self.state["late_counts"])
+        return {
+            "today_focus": float(totals[days == today, FOCUS].sum()),
+            "week_focus": float(totals[this_week, FOCUS].sum()),
+            "total_focus": float(totals[:, FOCUS].sum()),
+            "completion_rate": float(totals[:, COMPLETED].sum() / started) if started else None,
+            "interruptions_per_day": float(totals[worked, STOPPED].mean()) if worked.any() else None,
+            "reminders": int(late_counts.sum()),
+            "late_p50": _histogram_percentile(late_counts, 50),
+            "late_p95": _histogram_percentile(late_counts, 95),
+            "late_max": self.state["late_max"],
+        }
+
+def _histogram_percentile(counts, percentile):
+    # Upper edge of the bucket holding the percentile, None without data
+    total = counts.sum()
+    if not total:
+        return None
+    bucket = int(np.searchsorted(np.cumsum(counts), total * percentile / 100))
+    return LATENESS_EDGES[bucket + 1]
+
+def load_stats(directory):
+    return StatsCache(directory).update().report()
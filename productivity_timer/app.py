@@ -0,0 +1,746 @@
+import math
+import os
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from .backends import create_flasher, create_notification_backend, set_window_icon
+from .checkpoint import SessionCheckpoint, load_checkpoint, restore_session
+from .durations import parse_duration
+from .engine import TimerEngine, format_time
+from .journal import SessionJournal
+from .latency import OVERLAY_INTERVAL, LatencyMonitor, format_overlay, format_report
+from .notifier import NotificationDispatcher
+from .power import WakeupMeter, tick_delay
+from .presets import DEFAULT_BREAK, DEFAULT_WORK, Preset, PresetStore
+from .reminders import NotificationEntry, parse_when
+from .scheduler import parse_resolution
+from .startup import StartupTrace
+from .storage import data_dir
+from .widgets import CircularProgressBar, ModernEntry, ShadowLabel, StatsPanel
+
+class ProductivityTimer:
+    def __init__(self, trace=None):
+        self.trace = trace or StartupTrace()
+        self.trace.mark("imports")
+        self.root = tk.Tk()
+        self.root.title("Productivity Timer")
+        # Reduced window size to ensure it fits on most screens
+        self.root.geometry("800x750")
+        self.root.configure(bg='#121212')
+        
+        # Tick, redraw and notification latencies, kept only when asked for
+        # with PRODUCTIVITY_TIMER_LATENCY=1
+        self.latency = None
+        if os.environ.get("PRODUCTIVITY_TIMER_LATENCY") == "1":
+            self.latency = LatencyMonitor()
+        self._tick_due = None
+        self._overlay_at = None
+        
+        # Notifications are delivered off the Tk thread
+        self.notification_backend = create_notification_backend()
+        self.notifier = NotificationDispatcher(
+            self.notification_backend.send if self.notification_backend else None,
+            self._show_message_box,
+            observe=self.latency and (lambda seconds: self.latency.record("delivery", seconds)))
+        
+        # Screen flash backend, xrandr or a Tk overlay, created on first flash
+        self.flasher = None
+        self._flasher_ready = False
+        
+        set_window_icon(self.root)
+        
+        self.work_time = tk.StringVar(value=DEFAULT_WORK)
+        self.break_time = tk.StringVar(value=DEFAULT_BREAK)
+        # The countdown itself lives in the GUI-free engine
+        self.engine = TimerEngine(period_seconds=self._period_seconds,
+                                  resolution=self._tick_resolution())
+        self.engine.add_listener(self._on_timer_event)
+        self._tick_id = None
+        self._stats_busy = False
+        # Hidden windows only wake up for reminders and period ends
+        self._visible = True
+        self.wakeups = WakeupMeter()
+        
+        # Create data directory for settings if it doesn't exist
+        self.data_dir = data_dir()
+        # Periods, reminders and interruptions are kept in an append-only journal
+        self.journal = SessionJournal(self.data_dir)
+        self.engine.add_listener(self.journal)
+        # The running session is checkpointed on every change, see _recover_session
+        self.checkpoint = SessionCheckpoint(
+            self.engine, self.data_dir,
+            settings=lambda: {"work": self.work_time.get(), "break": self.break_time.get()})
+        self.engine.add_listener(self.checkpoint)
+        # Presets are read after the first frame, see _load_presets
+        self.presets = None
+        # Local control API, opt-in and started after the first frame
+        self.control = None
+        self.status_export = None
+        self._mapped = False
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.trace.mark("window")
+        
+        self._create_ui()
+        self.trace.mark("widgets")
+        self._recover_session()
+        self.trace.mark("recovery")
+        self.root.bind("<Map>", self._on_first_map, add="+")
+        for sequence in ("<Map>", "<Unmap>", "<Visibility>"):
+            self.root.bind(sequence, self._on_visibility, add="+")
+        
+    def _on_first_map(self, event):
+        # The window is mapped, report once it has been drawn
+        if event.widget is self.root and not self._mapped:
+            self._mapped = True
+            self.root.after_idle(self.trace.finish)
+            self.root.after(0, self._refresh_stats)
+            self.root.after(0, self._load_presets)
+            self.root.after(0, self._start_control)
+            self.root.after(0, self._start_status_export)
+
+    def _tick_resolution(self):
+        # PRODUCTIVITY_TIMER_TICK=0.1 ticks every 100 ms, =adaptive picks a
+        # resolution from the period length, one second otherwise
+        try:
+            return parse_resolution(os.environ.get("PRODUCTIVITY_TIMER_TICK", "1"))
+        except ValueError:
+            return 1.0
+
+    def _recover_session(self):
+        # A session left behind by a crash carries on where it was, before
+        # the first frame so it is never shown idle. Reading one small file
+        # is quick enough to do here.
+        data = load_checkpoint(self.data_dir)
+        if data is None:
+            return
+        settings = data.get("settings", {})
+        self.work_time.set(settings.get("work", DEFAULT_WORK))
+        self.break_time.set(settings.get("break", DEFAULT_BREAK))
+        try:
+            notifications = restore_session(self.engine, data)
+        except ValueError:
+            self.engine.reset()
+            self.engine.clear_reminders()
+            return
+        self.notifications_text.insert(
+            tk.END, "".join(f"{notif.describe()} - {notif.message}\n" for notif in notifications))
+        if self.engine.paused:
+            scheduler = self.engine.scheduler
+            remaining = scheduler.remaining_seconds()
+            self.progress_bar.draw((scheduler.total_seconds - remaining) / scheduler.total_seconds
+                                   * 100, format_time(remaining))
+            self.start_button.config(text="Resume")
+            self._update_status("Paused")
+        else:
+            self.start_button.config(state='disabled')
+            self._schedule_tick()
+
+    def _start_status_export(self):
+        # Status bars read the timer state from a memory-mapped file, written
+        # by the same tick that redraws the progress bar
+        # (PRODUCTIVITY_TIMER_STATUS=0 turns it off)
+        if os.environ.get("PRODUCTIVITY_TIMER_STATUS") == "0":
+            return
+        from .status_file import StatusExport
+        try:
+            self.status_export = StatusExport(self.engine)
+        except (OSError, ValueError):
+            return
+        self.engine.add_listener(self.status_export)
+
+    def _start_control(self):
+        # PRODUCTIVITY_TIMER_CONTROL=1 listens on ~/ProductivityTimer/control.sock,
+        # PRODUCTIVITY_TIMER_HTTP_PORT=PORT on 127.0.0.1:PORT
+        use_socket = os.environ.get("PRODUCTIVITY_TIMER_CONTROL") == "1"
+        http_port = os.environ.get("PRODUCTIVITY_TIMER_HTTP_PORT")
+        if not use_socket and not http_port:
+            return
+        from .control import SOCKET_NAME, ControlServer, socket_supported
+        actions = {"start": self.start_timer, "stop": self.stop_timer,
+                   "pause": self.pause_timer, "resume": self.start_timer,
+                   "reset": self._reset_all, "remind": self._append_notification,
+                   "latency": self._latency_report}
+        socket_path = None
+        if use_socket and socket_supported():
+            socket_path = os.path.join(self.data_dir, SOCKET_NAME)
+        server = ControlServer(actions, lambda callback: self.root.after(0, callback),
+                               socket_path, int(http_port) if http_port else None,
+                               on_subscribe=self._reschedule_tick)
+        # Binding happens off the Tk thread, the listener is added once it works
+        def start():
+            try:
+                server.start()
+            except OSError as e:
+                self.root.after(0, lambda: self._update_status(f"Control API unavailable: {e}"))
+                return
+            def ready():
+                self.control = server
+                self.engine.add_listener(server)
+            self.root.after(0, ready)
+        threading.Thread(target=start, daemon=True).start()
+        
+    def _create_ui(self):
+        # Create a scrollable canvas to ensure everything fits
+        canvas_container = tk.Frame(self.root, bg='#121212')
+        canvas_container.pack(fill=tk.BOTH, expand=True)
+        
+        # Add scrollbar
+        vscrollbar = ttk.Scrollbar(canvas_container, orient="vertical")
+        vscrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Create canvas with scrollbar
+        canvas = tk.Canvas(canvas_container, bg='#121212', yscrollcommand=vscrollbar.set, highlightthickness=0)
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        # Configure scrollbar to scroll canvas
+        vscrollbar.config(command=canvas.yview)
+        
+        # Create a frame inside the canvas for all content
+        main_frame = tk.Frame(canvas, bg='#121212', padx=20, pady=20)
+        
+        # Create window in canvas for the frame
+        canvas_window = canvas.create_window((0, 0), window=main_frame, anchor="nw")
+        
+        # Configure the canvas to resize with the window
+        def configure_canvas(event):
+            canvas.configure(scrollregion=canvas.bbox("all"))
+            # Resize the window inside canvas to match canvas width
+            canvas.itemconfig(canvas_window, width=event.width)
+        
+        canvas.bind("<Configure>", configure_canvas)
+        
+        # Circular Progress Bar - with smaller size for compact layout
+        top_frame = tk.Frame(main_frame, bg='#121212')
+        top_frame.pack(pady=15)
+        # PRODUCTIVITY_TIMER_SMOOTH=1 animates the arc between ticks
+        self.progress_bar = CircularProgressBar(
+            top_frame, size=250, smooth=os.environ.get("PRODUCTIVITY_TIMER_SMOOTH") == "1")
+        self.progress_bar.pack(side=tk.LEFT)
+        self.progress_bar.draw(0, "00:00")
+        
+        # Statistics over the session journal, filled in after startup
+        self.stats_panel = StatsPanel(top_frame)
+        self.stats_panel.pack(side=tk.LEFT, fill=tk.Y, padx=(15,0))
+        
+        # Settings Section - More compact
+        settings_frame = tk.Frame(main_frame, bg='#1e1e1e', padx=10, pady=10)
+        settings_frame.pack(fill=tk.X, pady=10)
+        
+        self.work_entry = ModernEntry(settings_frame, "Work Time (minutes, or 25m30s, 90s, 0.5h)",
+                                      textvariable=self.work_time)
+        self.work_entry.pack(fill=tk.X, pady=5)
+        
+        self.break_entry = ModernEntry(settings_frame, "Break Time (minutes, or 5m, 90s)",
+                                       textvariable=self.break_time)
+        self.break_entry.pack(fill=tk.X, pady=5)
+        
+        # Named presets of durations and reminders
+        preset_frame = tk.Frame(settings_frame, bg='#1e1e1e')
+        preset_frame.pack(fill=tk.X, pady=5)
+        preset_frame.grid_columnconfigure(0, weight=1)
+        
+        self.preset_name = tk.StringVar()
+        self.preset_box = ttk.Combobox(preset_frame, textvariable=self.preset_name,
+                                       font=('Helvetica', 11))
+        self.preset_box.grid(row=0, column=0, padx=(0,5), pady=5, sticky="ew")
+        
+        for column, (text, command, color) in enumerate((
+                ("Load", self._apply_selected_preset, '#3498db'),
+                ("Save", self._save_preset, '#27ae60'),
+                ("Delete", self._delete_preset, '#e67e22')), start=1):
+            button = tk.Button(preset_frame, text=text, command=command,
+                               bg=color, fg='white', font=('Helvetica', 11, 'bold'),
+                               relief=tk.FLAT, padx=10, pady=5, bd=0, highlightthickness=0)
+            button.grid(row=0, column=column, padx=(0,5), pady=5)
+        
+        # Notifications Section - More compact
+        notif_frame = tk.Frame(main_frame, bg='#1e1e1e', padx=10, pady=10)
+        notif_frame.pack(fill=tk.X, pady=10)
+        
+        notif_heading = ShadowLabel(notif_frame, "Notifications",
+                                    font=('Helvetica', 12, 'bold'),
+                                    fg='white',
+                                    bg='#1e1e1e',
+                                    offset=(2,2),
+                                    shadow_color='black')
+        notif_heading.pack(anchor='w', pady=(0,5))
+        
+        # Use grid layout for better control of notification input fields
+        notif_input_frame = tk.Frame(notif_frame, bg='#1e1e1e')
+        notif_input_frame.pack(fill=tk.X, pady=5)
+        notif_input_frame.grid_columnconfigure(0, weight=3)
+        notif_input_frame.grid_columnconfigure(1, weight=3)
+        notif_input_frame.grid_columnconfigure(2, weight=1)
+        notif_input_frame.grid_columnconfigure(3, weight=1)
+        
+        self.notification_percentage = ModernEntry(notif_input_frame, "When (50%, +10m, @14:30, every 20m)")
+        self.notification_percentage.grid(row=0, column=0, padx=(0,5), pady=5, sticky="ew")
+        
+        self.notification_message = ModernEntry(notif_input_frame, "Message")
+        self.notification_message.grid(row=0, column=1, padx=(0,5), pady=5, sticky="ew")
+        
+        # Notification buttons
+        add_button = tk.Button(notif_input_frame, text="Add", command=self._add_notification,
+                               bg='#3498db', fg='white', font=('Helvetica', 11, 'bold'),
+                               relief=tk.FLAT, padx=10, pady=5, bd=0, highlightthickness=0)
+        add_button.grid(row=0, column=2, padx=(0,5), pady=5)
+        
+        clear_notif_button = tk.Button(notif_input_frame, text="Clear", command=self._clear_notifications,
+                                       bg='#e67e22', fg='white', font=('Helvetica', 11, 'bold'),
+                                       relief=tk.FLAT, padx=10, pady=5, bd=0, highlightthickness=0)
+        clear_notif_button.grid(row=0, column=3, padx=(0,5), pady=5)
+        
+        # Bulk reminder packs, from a CSV/JSON file or pasted from the clipboard
+        bulk_frame = tk.Frame(notif_frame, bg='#1e1e1e')
+        bulk_frame.pack(fill=tk.X)
+        for text, command in (("Import...", self._import_notifications),
+                              ("Paste", self._paste_notifications),
+                              ("Export...", self._export_notifications)):
+            button = tk.Button(bulk_frame, text=text, command=command,
+                               bg='#333333', fg='white', font=('Helvetica', 10),
+                               relief=tk.FLAT, padx=8, pady=3, bd=0, highlightthickness=0)
+            button.pack(side=tk.LEFT, padx=(0,5))
+        
+        # Notification text area - smaller height
+        self.notifications_text = tk.Text(notif_frame, height=4,
+                                          bg='#333333', fg='white',
+                                          font=('Helvetica', 10),
+                                          relief=tk.FLAT,
+                                          padx=6, pady=6)
+        self.notifications_text.pack(fill=tk.X, pady=5)
+        
+        # Control buttons - using grid for better alignment
+        button_frame = tk.Frame(main_frame, bg='#121212')
+        button_frame.pack(fill=tk.X, pady=10)
+        button_frame.grid_columnconfigure(0, weight=1)
+        button_frame.grid_columnconfigure(1, weight=1)
+        button_frame.grid_columnconfigure(2, weight=1)
+        
+        self.start_button = tk.Button(button_frame, text="Start",
+                                      command=self.start_timer,
+                                      bg='#3498db', fg='white',
+                                      font=('Helvetica', 12, 'bold'),
+                                      relief=tk.FLAT, padx=20, pady=8, bd=0, highlightthickness=0)
+        self.start_button.grid(row=0, column=0, padx=5, pady=5)
+        
+        # Pausing keeps the time already spent, Start then resumes
+        self.stop_button = tk.Button(button_frame, text="Pause",
+                                     command=self.pause_timer,
+                                     bg='#e74c3c', fg='white',
+                                     font=('Helvetica', 12, 'bold'),
+                                     relief=tk.FLAT, padx=20, pady=8, bd=0, highlightthickness=0)
+        self.stop_button.grid(row=0, column=1, padx=5, pady=5)
+
+        self.reset_button = tk.Button(button_frame, text="Reset",
+                                      command=self._reset_all,
+                                      bg='#9b59b6', fg='white',
+                                      font=('Helvetica', 12, 'bold'),
+                                      relief=tk.FLAT, padx=20, pady=8, bd=0, highlightthickness=0)
+        self.reset_button.grid(row=0, column=2, padx=5, pady=5)
+
+        self.status_label = ShadowLabel(main_frame, "Ready",
+                                        font=('Helvetica', 12),
+                                        fg='white',
+                                        bg='#121212',
+                                        offset=(1,1),
+                                        shadow_color='black')
+        self.status_label.pack(pady=5)
+        
+        # Shown while a session is under way, see _show_period
+        self.period_status = ShadowLabel(main_frame, "Work Period",
+                                         font=('Helvetica', 12, 'bold'),
+                                         fg='#3498db',
+                                         bg='#121212',
+                                         offset=(1,1),
+                                         shadow_color='black')
+        
+        # Show notification status
+        if not self.notification_backend:
+            notification_status = ShadowLabel(
+                main_frame, 
+                "Note: desktop notifications unavailable, reminders will show as dialogs.",
+                font=('Helvetica', 10),
+                fg='yellow',
+                bg='#121212',
+                offset=(1,1),
+                shadow_color='black'
+            )
+            notification_status.pack(pady=5)
+        
+        # Make sure scrolling works with mousewheel
+        def _on_mousewheel(event):
+            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        
+        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        # X11 reports the wheel as buttons 4 and 5
+        canvas.bind_all("<Button-4>", lambda event: canvas.yview_scroll(-1, "units"))
+        canvas.bind_all("<Button-5>", lambda event: canvas.yview_scroll(1, "units"))
+    
+    def _clear_notifications(self):
+        self.engine.clear_reminders()
+        self.notifications_text.delete('1.0', tk.END)
+
+    def _reset_all(self):
+        self.stop_timer()
+        self.work_time.set(DEFAULT_WORK)
+        self.break_time.set(DEFAULT_BREAK)
+        self._clear_notifications()
+        self.progress_bar.draw(0, "00:00")
+        self._update_status("Ready")
+        self.engine.reset()
+
+    def _add_notification(self):
+        from tkinter import messagebox
+        try:
+            notif = NotificationEntry(message=self.notification_message.get(),
+                                      **parse_when(self.notification_percentage.get())).check()
+        except ValueError as e:
+            messagebox.showerror("Error", f"Please enter a valid reminder time and message ({e})")
+            return
+        self._append_notification(notif)
+        self.notification_percentage.delete(0, tk.END)
+        self.notification_message.delete(0, tk.END)
+
+    def _append_notification(self, notif):
+        self.engine.add_reminder(notif)
+        self.notifications_text.insert(tk.END, f"{notif.describe()} - {notif.message}\n")
+    
+    def _set_notifications(self, notifications, append=False):
+        # One engine update and one Text insert, however many reminders there are
+        if append:
+            self.engine.set_reminders(self.engine.notifications + list(notifications))
+        else:
+            self.engine.set_reminders(notifications)
+            self.notifications_text.delete('1.0', tk.END)
+        self.notifications_text.insert(
+            tk.END, "".join(f"{notif.describe()} - {notif.message}\n" for notif in notifications))
+
+    def _import_from(self, stream, name=None):
+        from tkinter import messagebox
+        from .reminder_io import read_reminders
+        result = read_reminders(stream, name, existing=self.engine.notifications)
+        self._set_notifications(result.entries, append=True)
+        summary = f"Imported {len(result.entries)} reminders"
+        if result.duplicates:
+            summary += f", skipped {result.duplicates} duplicates"
+        self._update_status(summary)
+        if result.errors:
+            lines = [f"row {number}: {reason}" if number else reason
+                     for number, reason in result.errors[:10]]
+            if len(result.errors) > 10:
+                lines.append(f"... and {len(result.errors) - 10} more")
+            messagebox.showwarning("Import", f"{len(result.errors)} rows were skipped:\n"
+                                   + "\n".join(lines))
+
+    def _import_notifications(self):
+        from tkinter import filedialog, messagebox
+        path = filedialog.askopenfilename(
+            title="Import reminders",
+            filetypes=[("Reminder packs", "*.csv *.json *.jsonl"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            with open(path, encoding="utf-8", newline="") as handle:
+                self._import_from(handle, path)
+        except (OSError, UnicodeDecodeError) as e:
+            messagebox.showerror("Error", f"Could not read {path}: {e}")
+
+    def _paste_notifications(self):
+        import io
+        try:
+            text = self.root.clipboard_get()
+        except tk.TclError:
+            self._update_status("Clipboard is empty")
+            return
+        self._import_from(io.StringIO(text))
+
+    def _export_notifications(self):
+        from tkinter import filedialog, messagebox
+        from .reminder_io import write_reminders
+        path = filedialog.asksaveasfilename(
+            title="Export reminders", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8", newline="") as handle:
+                write_reminders(self.engine.notifications, handle,
+                                "json" if path.lower().endswith(".json") else "csv")
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not write {path}: {e}")
+
+    def _load_presets(self):
+        # Reading the presets file happens off the Tk thread, like the stats
+        def load():
+            try:
+                store = PresetStore(self.data_dir).load()
+            except OSError:
+                store = PresetStore(self.data_dir)
+            self.root.after(0, lambda: self._presets_loaded(store))
+        threading.Thread(target=load, daemon=True).start()
+
+    def _presets_loaded(self, store):
+        self.presets = store
+        self.preset_box.config(values=store.names())
+        self.preset_name.set(store.current or "")
+        preset = store.startup_preset()
+        # Restore the last settings unless the user already changed something
+        if preset and not (self.engine.running or self.engine.paused
+                           or self.engine.notifications):
+            self._apply_preset(preset)
+
+    def _apply_preset(self, preset):
+        self.work_time.set(preset.work)
+        self.break_time.set(preset.break_)
+        self._set_notifications(preset.reminders)
+
+    def _current_preset(self):
+        reminders = [NotificationEntry.from_json(notif.to_json())
+                     for notif in self.engine.notifications]
+        return Preset(self.work_time.get(), self.break_time.get(), reminders)
+
+    def _apply_selected_preset(self):
+        preset = self.presets and self.presets.get(self.preset_name.get())
+        if preset:
+            self._apply_preset(preset)
+            self.presets.current = self.preset_name.get()
+
+    def _save_preset(self):
+        name = self.preset_name.get().strip()
+        if not name or self.presets is None:
+            return
+        self.presets.put(name, self._current_preset())
+        self._write_presets()
+
+    def _delete_preset(self):
+        if self.presets is None:
+            return
+        self.presets.delete(self.preset_name.get())
+        self.preset_name.set("")
+        self._write_presets()
+
+    def _write_presets(self):
+        from tkinter import messagebox
+        try:
+            self.presets.save()
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save presets: {e}")
+        self.preset_box.config(values=self.presets.names())
+
+    def start_timer(self):
+        if not self.engine.running:
+            self.start_button.config(state='disabled', text="Start")
+            self._run_engine(self.engine.start)
+            
+    def pause_timer(self):
+        if not self.engine.running:
+            return
+        self.engine.pause()
+        self._cancel_tick()
+        self.start_button.config(state='normal', text="Resume")
+        self._update_status("Paused")
+
+    def stop_timer(self):
+        self.engine.stop()
+        self._cancel_tick()
+        self.start_button.config(state='normal', text="Start")
+        self._update_status("Stopped")
+
+    def _update_status(self, message):
+        self.status_label.set_text(message)
+
+    def _show_period(self, is_work_period):
+        self.period_status.set_text("Work Period" if is_work_period else "Break Period",
+                                    fg='#3498db' if is_work_period else '#2ecc71')
+        if not self.period_status.winfo_manager():
+            self.period_status.pack(pady=5, after=self.status_label)
+
+    def _cancel_tick(self):
+        if self._tick_id is not None:
+            self.root.after_cancel(self._tick_id)
+            self._tick_id = None
+
+    def _reschedule_tick(self):
+        # A hidden window sleeps until the next event it knew of, a new
+        # reminder or subscriber may need it sooner
+        if self._tick_id is not None:
+            self._cancel_tick()
+            self._schedule_tick()
+
+    def _period_seconds(self, is_work_period):
+        # "25", "25m30s", "90s" or "0.5h", a bare number is minutes
+        return parse_duration(self.work_time.get() if is_work_period else self.break_time.get())
+
+    def _tick(self):
+        self._tick_id = None
+        if self.latency and self._tick_due is not None:
+            self.latency.record("tick_lateness", time.monotonic() - self._tick_due)
+        self.wakeups.record()
+        self._run_engine(self.engine.tick)
+
+    def _on_visibility(self, event):
+        if event.widget is not self.root:
+            return
+        if event.type == tk.EventType.Visibility:
+            visible = event.state != "VisibilityFullyObscured"
+        else:
+            visible = event.type == tk.EventType.Map
+        if visible == self._visible:
+            return
+        self._visible = visible
+        if self.trace.enabled:
+            import sys
+            print(f"power: window {'visible' if visible else 'hidden'}, "
+                  f"{self.wakeups.per_minute():.0f} wakeups in the last minute", file=sys.stderr)
+        # Coming back, the display catches up from the deadline right away
+        if visible and self.engine.running:
+            self._cancel_tick()
+            self._tick()
+
+    def _run_engine(self, step):
+        # Runs on the Tk thread and reschedules itself with root.after, so
+        # only this thread ever touches the widgets or the timer state.
+        try:
+            step()
+        except ValueError:
+            self._send_notification("Please enter valid durations for timer settings!")
+            self.stop_timer()
+            return
+        except Exception as e:
+            from tkinter import messagebox
+            self.stop_timer()
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            return
+        self._schedule_tick()
+
+    def _schedule_tick(self):
+        # Control API subscribers still want a tick every second
+        watched = self._visible or (self.control is not None and self.control.subscribers)
+        delay = tick_delay(self.engine, watched)
+        if delay is not None:
+            delay_ms = math.ceil(delay * 1000)
+            self._tick_due = time.monotonic() + delay_ms / 1000
+            self._tick_id = self.root.after(delay_ms, self._tick)
+
+    def _on_timer_event(self, event, info):
+        if event in ("period_start", "restore"):
+            self._show_period(info["is_work_period"])
+        if event in ("period_start", "resume") or (event == "restore" and not info["paused"]):
+            # Update status at start of timer
+            current_mode = "Work" if info["is_work_period"] else "Break"
+            self._update_status(f"{current_mode} in progress")
+        elif event == "stop":
+            self.period_status.pack_forget()
+            self._schedule_stats_refresh()
+        elif event == "reminders":
+            self._reschedule_tick()
+        elif event == "tick":
+            started = time.perf_counter()
+            self.progress_bar.draw(info["progress"], info["time_text"])
+            if self.latency:
+                self.latency.record("redraw", time.perf_counter() - started)
+                self._refresh_overlay()
+        elif event == "reminder":
+            self._alert(info["message"])
+        elif event == "skip" and info["periods"]:
+            self._schedule_stats_refresh()
+        elif event == "period_complete" and not info["skipped"]:
+            period_type = "Work" if info["is_work_period"] else "Break"
+            self._alert(f"{period_type} period completed!")
+            self._schedule_stats_refresh()
+            if info["is_work_period"]:
+                self._update_status(f"Work period complete! Taking a break.")
+            else:
+                self._update_status(f"Break complete! Starting work period.")
+    
+    def _schedule_stats_refresh(self):
+        # Give the journal writer a moment to put the event on disk
+        self.root.after(1000, self._refresh_stats)
+
+    def _refresh_stats(self):
+        # Reading the journal happens off the Tk thread, one refresh at a time
+        if self._stats_busy:
+            return
+        self._stats_busy = True
+        threading.Thread(target=self._load_stats, daemon=True).start()
+
+    def _load_stats(self):
+        from . import analytics
+        try:
+            if not analytics.HAS_NUMPY:
+                show = lambda: self.stats_panel.show_message("Install numpy for statistics")
+            else:
+                report = analytics.load_stats(self.data_dir)
+                show = lambda: self.stats_panel.show(report)
+        except Exception:
+            show = lambda: self.stats_panel.show_message("Statistics unavailable")
+        def done():
+            self._stats_busy = False
+            show()
+        self.root.after(0, done)
+
+    def _alert(self, message):
+        started = time.perf_counter()
+        self._send_notification(message)
+        self._flash_screen()
+        if self.latency:
+            self.latency.record("dispatch", time.perf_counter() - started)
+
+    def _refresh_overlay(self):
+        now = time.monotonic()
+        if self._overlay_at is None or now - self._overlay_at >= OVERLAY_INTERVAL:
+            self._overlay_at = now
+            self.progress_bar.set_overlay(format_overlay(self.latency.report()))
+
+    def _latency_report(self):
+        if not self.latency:
+            raise ValueError("latency is not recorded, start with PRODUCTIVITY_TIMER_LATENCY=1")
+        return self.latency.report()
+
+    def _send_notification(self, message):
+        # Never blocks: delivery happens on the dispatcher's worker threads
+        self.notifier.submit(message)
+
+    def _show_message_box(self, message):
+        # Fallback to message box if there is no backend or it keeps failing
+        def show():
+            from tkinter import messagebox
+            messagebox.showinfo("Productivity Timer", message)
+        self.root.after(0, show)
+
+    def _flash_screen(self):
+        if not self._flasher_ready:
+            self.flasher = create_flasher(self.root)
+            self._flasher_ready = True
+        if self.flasher:
+            self.flasher.flash((self.root.winfo_screenwidth(), self.root.winfo_screenheight()))
+    
+    def _on_close(self):
+        # Closing a running timer counts as an interruption
+        self.engine.stop()
+        self.journal.close()
+        self.checkpoint.close()
+        if self.control:
+            self.control.close()
+        if self.status_export:
+            self.status_export.close()
+        if self.latency:
+            import sys
+            print(format_report(self.latency.report()), file=sys.stderr)
+        # The current settings are kept for next time, apart from the named presets
+        if self.presets is not None:
+            self.presets.last = self._current_preset()
+            try:
+                self.presets.save()
+            except OSError:
+                pass
+        self.root.destroy()
+
+    def run(self):
+        self.root.mainloop()
+
+def main(started=None):
+    app = ProductivityTimer(trace=StartupTrace(started=started))
+    app.run()
@@ -0,0 +1,105 @@
+"""Platform backends for notifications, screen flashing and the window icon.
+
+Backends are picked at runtime and import their dependencies only when they
+are first used, so a Linux launch never imports plyer and a Windows launch
+never looks for xrandr.
+"""
+import importlib.util
+import os
+import sys
+import threading
+import tkinter as tk
+
+APP_NAME = "Productivity Timer"
+
+def is_windows(platform=None):
+    return (platform or sys.platform) == "win32"
+
+def is_x11(platform=None):
+    return (platform or sys.platform).startswith(("linux", "freebsd", "openbsd"))
+
+def resource_path(relative_path):
+    """Get absolute path to resource, works for dev and for PyInstaller"""
+    try:
+        # PyInstaller creates a temp folder and stores path in _MEIPASS
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, relative_path)
+
+class Notify2Backend:
+    name = "notify2"
+    module = "notify2"
+
+    def __init__(self):
+        self.notify2 = None
+        # The dispatcher sends from several threads, and they share one
+        # D-Bus connection
+        self.lock = threading.Lock()
+
+    def send(self, message):
+        with self.lock:
+            if self.notify2 is None:
+                # Import and connect to D-Bus on the first notification
+                import notify2
+                notify2.init(APP_NAME)
+                self.notify2 = notify2
+            notification = self.notify2.Notification(APP_NAME, message, "dialog-information")
+            notification.show()
+
+class PlyerBackend:
+    name = "plyer"
+    module = "plyer"
+
+    def __init__(self):
+        self.notification = None
+        self.lock = threading.Lock()
+
+    def send(self, message):
+        with self.lock:
+            if self.notification is None:
+                from plyer import notification
+                self.notification = notification
+        self.notification.notify(
+            title=APP_NAME,
+            message=message,
+            app_name=APP_NAME,
+            timeout=10
+        )
+
+def create_notification_backend(platform=None):
+    # Returns None when no desktop notification library is installed. Only
+    # the presence of the module is checked here, it is imported on first use.
+    candidates = [Notify2Backend] if is_x11(platform) else [PlyerBackend]
+    for backend in candidates:
+        if importlib.util.find_spec(backend.module) is not None:
+            return backend()
+    return None
+
+def create_flasher(root, platform=None):
+    # PRODUCTIVITY_TIMER_FLASH=xrandr|overlay|none picks the backend
+    backend = os.environ.get("PRODUCTIVITY_TIMER_FLASH")
+    if backend is None:
+        import shutil
+        backend = "xrandr" if is_x11(platform) and shutil.which("xrandr") else "none"
+    if backend == "xrandr":
+        from .flash import XrandrFlasher
+        return XrandrFlasher()
+    if backend == "overlay":
+        from .flash import TkOverlayFlasher
+        return TkOverlayFlasher(root)
+    return None
+
+def set_window_icon(root, platform=None):
+    # Windows takes the .ico, X11 and macOS a .png photo image
+    try:
+        if is_windows(platform):
+            icon_path = resource_path("timer_icon.ico")
+            if os.path.exists(icon_path):
+                root.iconbitmap(icon_path)
+        else:
+            icon_path = resource_path("timer_icon.png")
+            if os.path.exists(icon_path):
+                root.iconphoto(True, tk.PhotoImage(file=icon_path))
+    except Exception:
+        pass  # If icon loading fails, just use the default icon
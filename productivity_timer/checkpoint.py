@@ -0,0 +1,143 @@
+"""Checkpoints of the running session, so a crash does not lose it.
+
+session.json in the data directory describes the current period, how far
+it got and which reminders already fired. It is rewritten through an
+atomic rename whenever that state changes (a period starts, a reminder
+fires, the timer is paused or resumed), never on plain ticks, and removed
+when the session stops. Writes happen on a background thread, and only the
+latest snapshot is written when several pile up.
+
+On the next launch load_checkpoint() and restore_session() pick the
+session up again, counting the time since the checkpoint against the wall
+clock as if the machine had been suspended.
+"""
+import json
+import os
+import threading
+import time
+
+from .reminders import NotificationEntry
+from .storage import atomic_write
+
+CHECKPOINT_NAME = "session.json"
+VERSION = 1
+# Sessions saved longer ago than this are not resumed
+MAX_AGE = 12 * 3600
+SAVE_EVENTS = {"period_start", "reminder", "pause", "resume", "reminders", "skip", "restore"}
+# Stands for "remove the file" in the writer's queue
+_REMOVE = object()
+
+class SessionCheckpoint:
+    """Engine listener keeping session.json in step with the session.
+
+    settings, if given, returns a JSON-friendly dict saved alongside, such
+    as the durations as typed in the window.
+    """
+    def __init__(self, engine, directory, settings=None, wall_clock=time.time):
+        self.engine = engine
+        self.path = os.path.join(directory, CHECKPOINT_NAME)
+        self.settings = settings
+        self.wall_clock = wall_clock
+        self._pending = None
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    def __call__(self, event, info):
+        if event == "stop":
+            self._submit(_REMOVE)
+        elif (event in SAVE_EVENTS and not info.get("skipped")
+              and (self.engine.running or self.engine.paused)):
+            self._submit(self.snapshot())
+
+    def snapshot(self):
+        engine = self.engine
+        notifications = engine.notifications
+        return {
+            "version": VERSION,
+            "saved": self.wall_clock(),
+            "work_period": engine.is_work_period,
+            "total": engine.scheduler.total_seconds,
+            "remaining": engine.scheduler.remaining(),
+            "elapsed": engine.session_elapsed(),
+            "paused": engine.paused,
+            "reminders": [notif.to_json() for notif in notifications],
+            "fired": [index for index, notif in enumerate(notifications) if notif.triggered],
+            "settings": self.settings() if self.settings else {},
+        }
+
+    def _submit(self, data):
+        with self._cond:
+            if self._closed:
+                return
+            self._pending = data
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                data, self._pending = self._pending, None
+                if data is None:
+                    return
+            try:
+                if data is _REMOVE:
+                    if os.path.exists(self.path):
+                        os.remove(self.path)
+                else:
+                    atomic_write(self.path, json.dumps(data, separators=(",", ":")).encode())
+            except OSError:
+                pass
+
+    def close(self):
+        # Writes whatever is pending, then stops the writer
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+def load_checkpoint(directory, now=None):
+    """The saved session as a dict, or None if there is none worth resuming."""
+    path = os.path.join(directory, CHECKPOINT_NAME)
+    try:
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    now = time.time() if now is None else now
+    if not isinstance(data, dict) or data.get("version") != VERSION:
+        return None
+    if not 0 <= now - data.get("saved", 0) <= MAX_AGE:
+        return None
+    return data
+
+def restore_session(engine, data, now=None):
+    """Sets the engine's reminders from a checkpoint and continues its
+    session. Raises ValueError if the checkpoint does not make sense."""
+    now = time.time() if now is None else now
+    try:
+        notifications = [NotificationEntry.from_json(item).check() for item in data["reminders"]]
+        for index in data["fired"]:
+            # Negative indices would silently count from the end
+            if not isinstance(index, int) or not 0 <= index < len(notifications):
+                raise IndexError(f"no reminder {index!r}")
+            notifications[index].triggered = True
+        total = float(data["total"])
+        remaining = float(data["remaining"])
+        elapsed = float(data["elapsed"])
+        paused = bool(data["paused"])
+        is_work_period = bool(data["work_period"])
+        saved = float(data["saved"])
+    except (KeyError, IndexError, TypeError, AttributeError, ValueError) as e:
+        raise ValueError(f"broken checkpoint: {e}")
+    if not 0 <= remaining <= total or total <= 0:
+        raise ValueError("broken checkpoint: remaining time out of range")
+    engine.set_reminders(notifications)
+    engine.restore(is_work_period, total, remaining, elapsed, paused=paused,
+                   missed=0.0 if paused else now - saved)
+    return notifications
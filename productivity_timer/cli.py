@@ -0,0 +1,360 @@
+"""Terminal front end: python -m productivity_timer --work 25 --break 5"""
+import argparse
+import math
+import os
+import queue
+import sys
+import time
+
+from .durations import parse_duration
+from .engine import MIN_PERIOD, TimerEngine, format_time
+from .journal import SessionJournal
+from .manager import TimerManager
+from .reminder_io import read_reminders, write_reminders
+from .reminders import NotificationEntry, parse_reminder_spec
+from .scheduler import parse_resolution
+from .storage import data_dir
+
+def parse_reminder(value):
+    # "50:Drink water", "+10m:Stand up", "@14:30:Call", "every 20m during any:Drink water"
+    try:
+        return parse_reminder_spec(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def import_reminders(path, existing):
+    # Reports skipped rows on stderr and returns the new reminders
+    if path == "-":
+        result = read_reminders(sys.stdin, existing=existing)
+    else:
+        with open(path, encoding="utf-8", newline="") as handle:
+            result = read_reminders(handle, path, existing=existing)
+    for number, reason in result.errors:
+        where = f"{path}:{number}" if number else path
+        print(f"{where}: skipped, {reason}", file=sys.stderr)
+    return result.entries
+
+def export_reminders(notifications, path):
+    fmt = "json" if path.lower().endswith(".json") else "csv"
+    if path == "-":
+        write_reminders(notifications, sys.stdout, fmt)
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as handle:
+            write_reminders(notifications, handle, fmt)
+
+def parse_period(value):
+    # "25", "25m30s", "90s", "0.5h" -> seconds, a bare number is minutes
+    try:
+        seconds = parse_duration(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    if seconds < MIN_PERIOD:
+        raise argparse.ArgumentTypeError(f"work and break times must be at least "
+                                         f"{MIN_PERIOD:g}s")
+    return seconds
+
+def parse_simulation(value):
+    # "2d", "12h", a bare number is hours
+    try:
+        seconds = parse_duration(value, default_unit="h")
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError("the simulated time must be positive")
+    return seconds
+
+def parse_tick(value):
+    try:
+        return parse_resolution(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def parse_timer(value):
+    # "standup=15/5" -> ("standup", 900, 300), seconds of work and break
+    name, _, durations = value.partition("=")
+    work, _, break_ = durations.partition("/")
+    try:
+        work, break_ = parse_duration(work), parse_duration(break_ or "0")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"timers look like NAME=WORK/BREAK, got {value!r}")
+    if not name or work < MIN_PERIOD or break_ < MIN_PERIOD:
+        raise argparse.ArgumentTypeError(f"timers need a name and work and break times of at "
+                                         f"least {MIN_PERIOD:g}s")
+    return name, work, break_
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m productivity_timer",
+                                     description="Productivity Timer in the terminal")
+    parser.add_argument("--work", type=parse_period, default="60", metavar="DURATION",
+                        help="work time in minutes, or like 25m30s, 90s, 0.5h (default 60)")
+    parser.add_argument("--break", dest="break_", type=parse_period, default="15",
+                        metavar="DURATION",
+                        help="break time in minutes, or like 5m, 90s (default 15)")
+    parser.add_argument("--tick", type=parse_tick, default=1.0, metavar="SECONDS",
+                        help="seconds between screen updates, from 0.1, or 'adaptive' to "
+                             "follow the period length (default 1)")
+    parser.add_argument("--remind", type=parse_reminder, action="append", default=[],
+                        metavar="WHEN:MESSAGE",
+                        help="reminder, can be repeated; WHEN is a percentage of the work "
+                             "period (50), an offset (+10m), a time of day (@14:30) or a "
+                             "repeat (every 20m), optionally followed by 'during break' "
+                             "or 'during any'")
+    parser.add_argument("--reminders", action="append", default=[], metavar="FILE",
+                        help="import reminders from a CSV or JSON file, - for stdin; "
+                             "can be repeated")
+    parser.add_argument("--export-reminders", metavar="FILE",
+                        help="write all reminders to FILE (CSV, or JSON for *.json; - for "
+                             "stdout) and exit")
+    parser.add_argument("--timer", type=parse_timer, action="append", default=[],
+                        metavar="NAME=WORK/BREAK",
+                        help="run several named timers side by side instead of one, each "
+                             "with the given reminders; can be repeated (not journaled)")
+    parser.add_argument("--control", action="store_true",
+                        help="accept commands on the Unix socket ~/ProductivityTimer/control.sock")
+    parser.add_argument("--http-port", type=int, metavar="PORT",
+                        help="also accept commands over HTTP on 127.0.0.1:PORT")
+    parser.add_argument("--no-status-file", action="store_true",
+                        help="do not publish the timer state for status bars")
+    parser.add_argument("--status", action="store_true",
+                        help="print the state of the running timer in one line and exit")
+    parser.add_argument("--latency", action="store_true",
+                        help="print the tick, redraw and notification latencies of the "
+                             "running window (needs PRODUCTIVITY_TIMER_LATENCY=1 and "
+                             "PRODUCTIVITY_TIMER_CONTROL=1 there) and exit")
+    parser.add_argument("--simulate", type=parse_simulation, metavar="DURATION",
+                        help="run the session on a virtual clock for DURATION (like 2d or "
+                             "12h), print every period change and reminder with its time "
+                             "and exit")
+    parser.add_argument("--expect", metavar="FILE",
+                        help="with --simulate, compare the trace with FILE and fail if "
+                             "they differ")
+    parser.add_argument("--cycles", type=int, default=0,
+                        help="stop after this many work periods (default: run forever)")
+    parser.add_argument("--no-journal", action="store_true",
+                        help="do not record this session in ~/ProductivityTimer")
+    return parser
+
+class TerminalView:
+    def __init__(self, engine, cycles=0, out=sys.stdout, name=None):
+        self.engine = engine
+        self.cycles = cycles
+        self.out = out
+        # Named views print their events as lines instead of a progress bar
+        self.name = name
+        self.completed = 0
+
+    def __call__(self, event, info):
+        if info.get("skipped"):
+            # Periods that ran out while the machine was suspended go by quietly
+            return
+        if self.name and event == "period_start":
+            mode = "Work" if info["is_work_period"] else "Break"
+            self._line(f"{mode} {format_time(info['total'])}")
+        elif event == "tick" and not self.name:
+            mode = "Work " if info["is_work_period"] else "Break"
+            filled = int(info["progress"] / 5)
+            bar = "#" * filled + "." * (20 - filled)
+            self.out.write(f"\r{mode} {info['time_text']} [{bar}] {info['progress']:3.0f}%")
+            self.out.flush()
+        elif event == "reminder":
+            self._line(f"Reminder: {info['message']}\a")
+        elif event == "pause":
+            self._line(f"Paused with {format_time(info['remaining'])} left")
+        elif event == "period_complete":
+            period_type = "Work" if info["is_work_period"] else "Break"
+            self._line(f"{period_type} period completed!\a")
+            if info["is_work_period"]:
+                self.completed += 1
+                if self.cycles and self.completed >= self.cycles:
+                    self.engine.stop()
+
+    def _line(self, text):
+        if self.name:
+            text = f"[{self.name}] {text}"
+        self.out.write(f"\r\033[K{text}\n")
+        self.out.flush()
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.status:
+        return print_status()
+    if args.latency:
+        return print_latency()
+    engine = TimerEngine(args.work, args.break_, resolution=args.tick)
+    reminders = list(args.remind)
+    for path in args.reminders:
+        try:
+            imported = import_reminders(path, reminders)
+        except OSError as e:
+            print(f"Could not read {path}: {e}", file=sys.stderr)
+            return 2
+        reminders.extend(imported)
+    if args.export_reminders:
+        export_reminders(reminders, args.export_reminders)
+        return 0
+    if args.simulate:
+        return run_simulation(args, reminders)
+    if args.timer:
+        if args.control or args.http_port is not None:
+            print("--control and --http-port work with a single timer only", file=sys.stderr)
+            return 2
+        return run_timers(args.timer, reminders, args.cycles, args.tick)
+    engine.set_reminders(reminders)
+    engine.add_listener(TerminalView(engine, cycles=args.cycles))
+    journal = None
+    if not args.no_journal:
+        journal = SessionJournal(data_dir())
+        engine.add_listener(journal)
+    server = pending = None
+    if args.control or args.http_port is not None:
+        from .control import SOCKET_NAME, ControlServer
+        pending = queue.SimpleQueue()
+        actions = {"start": engine.start, "stop": engine.stop, "reset": engine.reset,
+                   "pause": engine.pause, "resume": engine.resume,
+                   "remind": engine.add_reminder}
+        socket_path = os.path.join(data_dir(), SOCKET_NAME) if args.control else None
+        server = ControlServer(actions, pending.put, socket_path, args.http_port)
+        try:
+            server.start()
+        except OSError as e:
+            print(f"Could not start the control server: {e}", file=sys.stderr)
+            return 2
+        engine.add_listener(server)
+    status_export = None
+    if not args.no_status_file:
+        from .status_file import StatusExport
+        status_export = StatusExport(engine)
+        engine.add_listener(status_export)
+    try:
+        engine.start()
+        run_engine(engine, pending)
+    except KeyboardInterrupt:
+        engine.stop()
+    finally:
+        if server:
+            server.close()
+        if status_export:
+            status_export.close()
+        if journal:
+            journal.close()
+    print()
+    return 0
+
+def run_engine(engine, pending=None):
+    # Ticks the engine on time. With a control server its commands arrive on
+    # `pending` and run in between, and the loop outlives a stopped timer.
+    if pending is None:
+        while engine.running:
+            time.sleep(engine.next_delay())
+            engine.tick()
+        return
+    tick_at = None
+    while True:
+        if tick_at is None and engine.running:
+            tick_at = engine.clock() + engine.next_delay()
+        timeout = None if tick_at is None else max(0.0, tick_at - engine.clock())
+        try:
+            callback = pending.get(timeout=timeout)
+        except queue.Empty:
+            tick_at = None
+            engine.tick()
+            continue
+        callback()
+        if not engine.running:
+            tick_at = None
+
+def run_simulation(args, reminders):
+    from .simulation import simulate
+    started = time.perf_counter()
+    trace = [str(event) for event in simulate(args.work, args.break_, reminders,
+                                              args.simulate, args.tick)]
+    elapsed = time.perf_counter() - started
+    print(f"simulated {args.simulate:g}s in {elapsed * 1000:.1f} ms, {len(trace)} events",
+          file=sys.stderr)
+    if not args.expect:
+        print("\n".join(trace))
+        return 0
+    import difflib
+    try:
+        with open(args.expect, encoding="utf-8") as handle:
+            expected = handle.read().splitlines()
+    except OSError as e:
+        print(f"Could not read {args.expect}: {e}", file=sys.stderr)
+        return 2
+    diff = list(difflib.unified_diff(expected, trace, args.expect, "simulation", lineterm=""))
+    if diff:
+        print("\n".join(diff))
+        return 1
+    print(f"trace matches {args.expect}", file=sys.stderr)
+    return 0
+
+def run_timers(timers, reminders, cycles=0, resolution=1.0):
+    # All timers share one TimerManager, so the process sleeps between deadlines
+    manager = TimerManager()
+    for name, work, break_ in timers:
+        # Every timer needs its own reminder objects, they remember having fired
+        engine = manager.add(name, work, break_,
+                             [NotificationEntry.from_json(notif.to_json()) for notif in reminders],
+                             resolution=resolution)
+        engine.add_listener(TerminalView(engine, cycles=cycles, name=name))
+    try:
+        for name in manager.names():
+            manager.start(name)
+        manager.run()
+    except KeyboardInterrupt:
+        for name in manager.running():
+            manager.stop(name)
+    return 0
+
+def print_status():
+    # One line for status bars, e.g. "Work 12:34 | next: Drink water in 03:00"
+    from .status_file import StatusReader
+    try:
+        reader = StatusReader()
+    except (OSError, ValueError):
+        print("No timer")
+        return 1
+    status = reader.read()
+    reader.close()
+    if status is None or status["mode"] == "idle":
+        print("Idle")
+        return 0
+    remaining = status["remaining"]
+    next_in = status["next_reminder_in"]
+    if status["running"]:
+        # Counted from the end time, the record may be a few seconds old
+        elapsed = max(0.0, time.time() - status["updated"])
+        remaining = max(0, math.ceil(status["ends_at"] - time.time()))
+        if next_in is not None:
+            next_in = max(0.0, next_in - elapsed)
+    line = f"{status['mode'].capitalize()} {format_time(remaining)}"
+    if status["paused"]:
+        line += " (paused)"
+    elif not status["running"]:
+        line += " (stopped)"
+    if status["next_reminder"]:
+        line += f" | next: {status['next_reminder']} in {format_time(math.ceil(next_in))}"
+    print(line)
+    return 0
+
+def print_latency():
+    # Asks the running timer over the control socket
+    import json
+    import socket
+    from .control import SOCKET_NAME
+    from .latency import format_report
+    path = os.path.join(data_dir(create=False), SOCKET_NAME)
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(10)
+            client.connect(path)
+            client.sendall(b'{"cmd": "latency"}\n')
+            reply = json.loads(client.makefile("rb").readline())
+    except (OSError, ValueError) as e:
+        print(f"No timer listening on {path}: {e}", file=sys.stderr)
+        return 1
+    if not reply.get("ok"):
+        print(reply.get("error"), file=sys.stderr)
+        return 1
+    print(format_report(reply["latency"]))
+    return 0
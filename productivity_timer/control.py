@@ -0,0 +1,297 @@
+"""Local control API for scripting the timer.
+
+Clients send newline-delimited JSON over a Unix domain socket, one request
+per line, and get one JSON line back for each:
+
+    {"cmd": "status"}
+    {"cmd": "start"}, {"cmd": "stop"}, {"cmd": "reset"}
+    {"cmd": "pause"}, {"cmd": "resume"}
+    {"cmd": "remind", "when": "+10m", "message": "Stand up"}
+    {"cmd": "subscribe"}
+    {"cmd": "latency"}
+
+Replies are {"ok": true, ...status} or {"ok": false, "error": "..."}. After
+subscribe the connection receives every engine event as a JSON line, and
+latency replies with {"ok": true, "latency": {...}} when the owner records
+latencies. The optional HTTP server on 127.0.0.1 offers the same as
+GET /status, POST /start, /stop, /reset, /pause, /resume and /remind,
+GET /latency and
+GET /events (server-sent events). HTTP requests that carry an Origin
+header, or a Host other than 127.0.0.1 or localhost on the server's port,
+are refused, so web pages in the browser cannot drive the timer.
+
+The server runs its own asyncio loop in a daemon thread. Commands are handed
+to the owner's thread through `schedule`, and status replies come from the
+last event seen, so clients never wait on the countdown and the countdown
+never waits on clients.
+"""
+import asyncio
+import concurrent.futures
+import json
+import os
+import socket
+import threading
+
+from .reminders import NotificationEntry, parse_when
+
+SOCKET_NAME = "control.sock"
+# Events kept for a subscriber that reads slowly, older ones are dropped
+SUBSCRIBER_QUEUE = 256
+COMMAND_TIMEOUT = 5.0
+HTTP_ROUTES = {("GET", "/status"): "status", ("POST", "/start"): "start",
+               ("POST", "/stop"): "stop", ("POST", "/reset"): "reset",
+               ("POST", "/pause"): "pause", ("POST", "/resume"): "resume",
+               ("POST", "/remind"): "remind", ("GET", "/latency"): "latency",
+               ("GET", "/events"): "subscribe"}
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 403: "Forbidden", 404: "Not Found"}
+
+def event_payload(event, info):
+    # JSON-friendly copy of an engine event
+    data = {"event": event}
+    for key, value in info.items():
+        if isinstance(value, NotificationEntry):
+            data["when"] = value.describe()
+        else:
+            data[key] = value
+    return data
+
+class ControlServer:
+    def __init__(self, actions, schedule, socket_path=None, http_port=None, on_subscribe=None):
+        # actions: command name -> callable, run on the owner's thread
+        # schedule(callback): runs callback soon on the owner's thread
+        # on_subscribe(): run on the owner's thread whenever a client subscribes
+        self.actions = actions
+        self.schedule = schedule
+        self.on_subscribe = on_subscribe
+        self.socket_path = socket_path
+        self.http_port = http_port
+        self.status = {"running": False}
+        self.subscribers = set()
+        self.loop = None
+        self.thread = None
+        self.servers = []
+        # Host headers the HTTP server answers to, set once it listens
+        self.http_hosts = set()
+        self.ready = threading.Event()
+        self.error = None
+
+    def __call__(self, event, info):
+        # Engine listener on the owner's thread, it never blocks
+        payload = event_payload(event, info)
+        status = dict(self.status)
+        if event in ("tick", "period_start"):
+            status.update(running=True, paused=False,
+                          mode="work" if info["is_work_period"] else "break")
+            status.update((key, value) for key, value in payload.items() if key != "event")
+        elif event == "pause":
+            status.update(running=False, paused=True, remaining=info["remaining"])
+        elif event == "stop":
+            status.update(running=False, paused=False)
+        # Replaced as a whole, so the server thread always sees a consistent dict
+        self.status = status
+        if self.loop is not None and self.subscribers:
+            self.loop.call_soon_threadsafe(self._publish, payload)
+
+    def start(self):
+        # Returns once the sockets are listening; raises OSError if they cannot be
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.error:
+            raise self.error
+        return self
+
+    def close(self):
+        if self.loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result(COMMAND_TIMEOUT)
+        except (concurrent.futures.TimeoutError, RuntimeError):
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(COMMAND_TIMEOUT)
+        self.loop = None
+        if self.socket_path:
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._listen())
+        except OSError as e:
+            self.error = e
+            self.ready.set()
+            loop.close()
+            return
+        self.loop = loop
+        self.ready.set()
+        loop.run_forever()
+        loop.close()
+
+    async def _listen(self):
+        if self.socket_path:
+            _remove_stale_socket(self.socket_path)
+            self.servers.append(await asyncio.start_unix_server(self._serve_socket,
+                                                                path=self.socket_path))
+            os.chmod(self.socket_path, 0o600)
+        if self.http_port is not None:
+            server = await asyncio.start_server(self._serve_http, "127.0.0.1", self.http_port)
+            self.servers.append(server)
+            port = server.sockets[0].getsockname()[1]
+            self.http_hosts = {f"127.0.0.1:{port}", f"localhost:{port}"}
+
+    async def _shutdown(self):
+        for server in self.servers:
+            server.close()
+        for queue in self.subscribers:
+            queue.put_nowait(None)
+
+    def _publish(self, payload):
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(payload)
+
+    async def _stream(self, send):
+        # Passes every event to send() until the server shuts down or the client goes away
+        queue = asyncio.Queue(SUBSCRIBER_QUEUE)
+        self.subscribers.add(queue)
+        if self.on_subscribe:
+            self.schedule(self.on_subscribe)
+        try:
+            while True:
+                payload = await queue.get()
+                if payload is None:
+                    return
+                await send(payload)
+        finally:
+            self.subscribers.discard(queue)
+
+    async def _call(self, name, *args):
+        future = concurrent.futures.Future()
+        def run():
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self.actions[name](*args))
+                except Exception as e:
+                    future.set_exception(e)
+        self.schedule(run)
+        return await asyncio.wait_for(asyncio.wrap_future(future), COMMAND_TIMEOUT)
+
+    async def handle(self, request):
+        """Runs one request dict and returns the reply dict."""
+        try:
+            cmd = request.get("cmd")
+            if cmd == "remind":
+                notif = NotificationEntry(message=str(request.get("message", "")),
+                                          **parse_when(str(request.get("when", "")))).check()
+                await self._call("remind", notif)
+            elif cmd in ("start", "stop", "reset", "pause", "resume"):
+                await self._call(cmd)
+                if cmd == "reset":
+                    self.status = {"running": False}
+            elif cmd == "latency":
+                if "latency" not in self.actions:
+                    return {"ok": False, "error": "latency is not recorded here"}
+                return {"ok": True, "latency": await self._call("latency")}
+            elif cmd != "status":
+                return {"ok": False, "error": f"unknown command {cmd!r}"}
+        except asyncio.TimeoutError:
+            return {"ok": False, "error": "the timer did not answer"}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+        return {"ok": True, **self.status}
+
+    async def _serve_socket(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    request = {"cmd": None}
+                if isinstance(request, dict) and request.get("cmd") == "subscribe":
+                    await _write_line(writer, {"ok": True, **self.status})
+                    await self._stream(lambda payload: _write_line(writer, payload))
+                    break
+                reply = await self.handle(request if isinstance(request, dict) else {})
+                await _write_line(writer, reply)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_http(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1")
+                if line in ("\r\n", "\n", ""):
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if len(request_line) < 2:
+                return
+            method, path = request_line[0], request_line[1].split("?")[0]
+            cmd = HTTP_ROUTES.get((method, path))
+            # Browsers add an Origin to cross-site requests, and a page reaching
+            # the port through a rebound DNS name still sends its own Host
+            if "origin" in headers or headers.get("host", "").lower() not in self.http_hosts:
+                await _write_http(writer, 403, {"ok": False, "error": "forbidden"})
+            elif cmd is None:
+                await _write_http(writer, 404, {"ok": False, "error": "not found"})
+            elif cmd == "subscribe":
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                             b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+                async def send(payload):
+                    writer.write(f"data: {json.dumps(payload)}\n\n".encode())
+                    await writer.drain()
+                await self._stream(send)
+            else:
+                request = {}
+                length = int(headers.get("content-length", 0))
+                if length:
+                    request = json.loads(await reader.readexactly(length))
+                    if not isinstance(request, dict):
+                        request = {}
+                request["cmd"] = cmd
+                reply = await self.handle(request)
+                await _write_http(writer, 200 if reply["ok"] else 400, reply)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+async def _write_line(writer, data):
+    writer.write(json.dumps(data).encode() + b"\n")
+    await writer.drain()
+
+async def _write_http(writer, code, data):
+    body = json.dumps(data).encode()
+    writer.write(f"HTTP/1.1 {code} {HTTP_REASONS[code]}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+
+def _remove_stale_socket(path):
+    # A socket left behind by a crash is removed, a live one means another
+    # timer is already listening there
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise OSError(f"another timer is already listening on {path}")
+    finally:
+        probe.close()
+
+def socket_supported():
+    return hasattr(socket, "AF_UNIX") and hasattr(asyncio, "start_unix_server")
@@ -0,0 +1,38 @@
+"""Durations written the way people type them: 90s, 25m, 1h30m, 0.5h, 25m30s, 2d."""
+import decimal
+import re
+
+UNITS = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+_PART = re.compile(r"(\d+(?:\.\d*)?|\.\d+)\s*([dhms])", re.IGNORECASE)
+
+def parse_duration(text, default_unit="m"):
+    """Seconds in `text`, a float. A bare number is in `default_unit`.
+
+    The sum is taken in decimal, so "0.1h" is exactly 360 seconds.
+    """
+    text = text.strip()
+    try:
+        seconds = decimal.Decimal(text) * UNITS[default_unit]
+    except decimal.InvalidOperation:
+        seconds = None
+    if seconds is None:
+        position = 0
+        seconds = decimal.Decimal(0)
+        for match in _PART.finditer(text):
+            if text[position:match.start()].strip():
+                break
+            seconds += decimal.Decimal(match.group(1)) * UNITS[match.group(2).lower()]
+            position = match.end()
+        if not position or text[position:].strip():
+            raise ValueError(f"invalid duration {text!r}")
+    if not seconds.is_finite():
+        raise ValueError(f"invalid duration {text!r}")
+    return float(seconds)
+
+def format_duration_spec(seconds):
+    # The inverse of parse_duration, 5400 -> "1h30m"
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    parts = [f"{value:g}{unit}" for value, unit in ((hours, "h"), (minutes, "m"), (secs, "s"))
+             if value]
+    return "".join(parts) or "0s"
@@ -0,0 +1,299 @@
+import time
+
+from .reminders import ReminderQueue
+from .scheduler import TickScheduler
+
+# A jump of the wall clock ahead of clock() by more than this many seconds
+# is taken for a suspended machine
+SUSPEND_THRESHOLD = 5.0
+# Time skipped past the end of a period carries into the ones after it, up
+# to this many seconds in all
+MAX_SKIP = 12 * 3600
+# Shortest work or break period in seconds
+MIN_PERIOD = 1.0
+
+def format_time(seconds):
+    mins, secs = divmod(int(seconds), 60)
+    return f"{mins:02d}:{secs:02d}"
+
+class TimerEngine:
+    """Work/break cycle with reminders, independent of any GUI.
+
+    The engine never sleeps and never starts threads. Its owner calls tick()
+    after next_delay() seconds, from a Tk after() callback, a terminal loop
+    or a test driving a fake clock. Everything that happens is reported to
+    the listeners as listener(event, info), with these events:
+
+      period_start     is_work_period, total, skipped
+      tick             is_work_period, remaining, total, progress, time_text
+      reminder         notification, message, lateness
+      period_complete  is_work_period, skipped
+      pause            is_work_period, remaining, total
+      resume           is_work_period, remaining, total
+      stop             is_work_period, remaining
+      reminders        count, whenever the list of reminders changes
+      skip             seconds, periods, interrupted, left, is_work_period,
+                       remaining, total
+      restore          is_work_period, remaining, total, paused
+
+    pause() freezes the countdown and start() or resume() carries on from
+    the same point, with reminders that already fired kept fired; stop()
+    ends the session and the next start() begins a fresh work period.
+
+    clock() is monotonic and, on some systems, stands still while the
+    machine is suspended. Every tick compares it with the wall clock and
+    skips the countdown ahead by whatever it missed. Periods that ran out
+    meanwhile come with skipped=True, and the skip event that follows
+    says how many there were, the mode of the period that was interrupted
+    and the seconds it had left, and where the countdown is now.
+    """
+    def __init__(self, work_seconds=3600, break_seconds=900, period_seconds=None,
+                 clock=time.monotonic, wall_clock=time.time, resolution=1.0):
+        self.work_seconds = work_seconds
+        self.break_seconds = break_seconds
+        # Optional callable(is_work_period) -> seconds, read at every period start
+        self.period_seconds = period_seconds
+        self.clock = clock
+        # Seconds between ticks, from 0.1, or "adaptive", see TickScheduler
+        self.resolution = resolution
+        # Places reminders set for a time of day and notices suspends, so a
+        # simulated clock needs a simulated wall clock to go with it
+        self.wall_clock = wall_clock
+        self.notifications = []
+        self.is_work_period = True
+        self.running = False
+        self.paused = False
+        self.scheduler = None
+        self.reminder_queue = None
+        self.listeners = []
+        # wall_clock() - clock() at the last tick
+        self._clock_offset = None
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def _emit(self, event, **info):
+        for listener in self.listeners:
+            listener(event, info)
+
+    def add_reminder(self, notif):
+        self.notifications.append(notif)
+        # A paused session keeps its queue, resume() carries on with it
+        if self.running or self.paused:
+            self.reminder_queue.add(notif, self.clock())
+        self._emit("reminders", count=len(self.notifications))
+
+    def set_reminders(self, notifications):
+        # Replaces every reminder at once, with one queue rebuild when running
+        self.notifications = list(notifications)
+        if self.running or self.paused:
+            self.reminder_queue.rebuild(self.notifications, self.clock())
+        self._emit("reminders", count=len(self.notifications))
+
+    def clear_reminders(self):
+        self.notifications = []
+        if self.reminder_queue:
+            self.reminder_queue.clear()
+        self._emit("reminders", count=0)
+
+    def start(self):
+        if self.paused:
+            self.resume()
+            return
+        if self.running:
+            return
+        self.running = True
+        # A fresh session always opens with work, even after stopping in a break
+        self.is_work_period = True
+        self.reminder_queue = ReminderQueue(self.clock, self.wall_clock)
+        self.reminder_queue.start_session(self.notifications, self.clock())
+        self._sync_wall_clock()
+        try:
+            self._start_period()
+        except ValueError:
+            self.running = False
+            raise
+        self.tick()
+
+    def pause(self):
+        if not self.running:
+            return
+        self.running = False
+        self.paused = True
+        self.scheduler.pause()
+        self.reminder_queue.pause(self.clock())
+        self._emit("pause", is_work_period=self.is_work_period,
+                   remaining=self.scheduler.remaining_seconds(),
+                   total=self.scheduler.total_seconds)
+
+    def resume(self):
+        if not self.paused:
+            return
+        self.paused = False
+        self.running = True
+        self.scheduler.resume()
+        self.reminder_queue.resume(self.clock())
+        self._sync_wall_clock()
+        self._emit("resume", is_work_period=self.is_work_period,
+                   remaining=self.scheduler.remaining_seconds(),
+                   total=self.scheduler.total_seconds)
+        self.tick()
+
+    def stop(self):
+        if self.running or self.paused:
+            self.running = False
+            self.paused = False
+            self._emit("stop", is_work_period=self.is_work_period,
+                       remaining=self.scheduler.remaining_seconds())
+
+    def reset(self):
+        self.stop()
+        self.is_work_period = True
+        self.scheduler = None
+        self.reminder_queue = None
+
+    def restore(self, is_work_period, total, remaining, elapsed, paused=False, missed=0.0):
+        """Continues a saved session with the reminders already set.
+
+        remaining and elapsed (active seconds since the session started) are
+        as they were when it was saved; missed is how much time went by since
+        then, and counts as time suspended unless the session was paused.
+        """
+        self.stop()
+        now = self.clock()
+        self.is_work_period = is_work_period
+        self.scheduler = TickScheduler(total, clock=self.clock, remaining=remaining,
+                                       resolution=self.resolution)
+        self.reminder_queue = ReminderQueue(self.clock, self.wall_clock)
+        self.reminder_queue.start_session(self.notifications, now, started=now - elapsed)
+        self.reminder_queue.start_period(is_work_period, now - (total - remaining), total,
+                                         self.notifications)
+        self.running = True
+        self._sync_wall_clock()
+        if paused:
+            self.running = False
+            self.paused = True
+            self.scheduler.pause()
+            self.reminder_queue.pause(now)
+        elif missed > 0:
+            self.skip(missed)
+        # Skipping may have moved on to a later period
+        self._emit("restore", is_work_period=self.is_work_period,
+                   remaining=self.scheduler.remaining_seconds(),
+                   total=self.scheduler.total_seconds, paused=paused)
+        self.tick()
+
+    def skip(self, seconds):
+        # Moves a running countdown `seconds` ahead as if it had kept going:
+        # periods that ended meanwhile complete, each next one starting where
+        # the last ended, and reminders due in between are dropped
+        if not self.running or seconds <= 0:
+            return
+        seconds = min(seconds, MAX_SKIP)
+        now = self.clock()
+        # clock() stood still, so this is what was left when it stopped
+        interrupted, left = self.is_work_period, self.scheduler.remaining_seconds()
+        self.scheduler.skip(seconds)
+        self.reminder_queue.skip(seconds, now)
+        periods = 0
+        while self.running and self.scheduler.expired():
+            # Nobody was there for these, listeners should not alert or count them
+            self._emit("period_complete", is_work_period=self.is_work_period, skipped=True)
+            self.is_work_period = not self.is_work_period
+            periods += 1
+            if self.running:
+                self._start_period(self.scheduler.deadline_ns, skipped=True)
+                self.reminder_queue.skip(0, now)
+        self._emit("skip", seconds=seconds, periods=periods, interrupted=interrupted, left=left,
+                   is_work_period=self.is_work_period,
+                   remaining=self.scheduler.remaining_seconds(),
+                   total=self.scheduler.total_seconds)
+
+    def _sync_wall_clock(self):
+        self._clock_offset = self.wall_clock() - self.clock()
+
+    def _check_suspend(self):
+        offset = self.wall_clock() - self.clock()
+        missed = offset - self._clock_offset
+        self._clock_offset = offset
+        # Wall clock corrections backwards, or by a few seconds, are ignored
+        if missed > SUSPEND_THRESHOLD:
+            self.skip(missed)
+
+    def session_elapsed(self):
+        # Active seconds since start(), None without a session
+        if self.reminder_queue is None:
+            return None
+        return self.reminder_queue.elapsed(self.clock())
+
+    def next_delay(self):
+        # Seconds until tick() should be called again, None when stopped
+        if not self.running:
+            return None
+        # Reminders fire on time whatever the tick resolution
+        delay = self.scheduler.next_delay()
+        upcoming = self.reminder_queue.peek()
+        if upcoming is not None:
+            delay = min(delay, max(0.0, upcoming[0] - self.clock()))
+        return delay
+
+    def next_event_delay(self):
+        # Seconds until the period ends or a reminder fires, None when stopped.
+        # Nothing but the display changes before then.
+        if not self.running:
+            return None
+        delay = self.scheduler.remaining()
+        upcoming = self.reminder_queue.peek()
+        if upcoming is not None:
+            delay = min(delay, max(0.0, upcoming[0] - self.clock()))
+        return delay
+
+    def next_reminder(self):
+        # (seconds until it fires, notification) of the next reminder, or None
+        upcoming = self.reminder_queue.peek() if self.running else None
+        if upcoming is None:
+            return None
+        deadline, notif = upcoming
+        return max(0.0, deadline - self.clock()), notif
+
+    def _start_period(self, start_ns=None, skipped=False):
+        if self.period_seconds:
+            seconds = self.period_seconds(self.is_work_period)
+        else:
+            seconds = self.work_seconds if self.is_work_period else self.break_seconds
+        if not seconds >= MIN_PERIOD:
+            raise ValueError(f"periods must be at least {MIN_PERIOD:g}s long")
+        self.scheduler = TickScheduler(seconds, clock=self.clock, resolution=self.resolution,
+                                       start_ns=start_ns)
+        # Reminders tied to the period are re-armed for each one
+        for notif in self.notifications:
+            if notif.period_relative and notif.fires_in(self.is_work_period):
+                notif.triggered = False
+        self.reminder_queue.start_period(self.is_work_period, self.scheduler.deadline - seconds,
+                                         seconds, self.notifications)
+        self._emit("period_start", is_work_period=self.is_work_period,
+                   total=self.scheduler.total_seconds, skipped=skipped)
+
+    def tick(self):
+        if self.running:
+            self._check_suspend()
+        while self.running:
+            total_seconds = self.scheduler.total_seconds
+            remaining = self.scheduler.remaining_seconds()
+            # From the exact remaining time, so finer ticks move the arc
+            total_ns = self.scheduler.total_ns
+            progress = (total_ns - self.scheduler.remaining_ns()) / total_ns * 100
+            self._emit("tick", is_work_period=self.is_work_period, remaining=remaining,
+                       total=total_seconds, progress=progress, time_text=format_time(remaining))
+            # Fire every reminder whose time has come since the last tick
+            for notif, lateness in self.reminder_queue.due(self.clock()):
+                notif.triggered = True
+                self._emit("reminder", notification=notif, message=notif.message,
+                           lateness=lateness)
+            if remaining > 0 or not self.running:
+                return
+            self._emit("period_complete", is_work_period=self.is_work_period, skipped=False)
+            self.is_work_period = not self.is_work_period
+            if self.running:
+                # From the deadline, so a late tick does not delay every later period
+                self._start_period(self.scheduler.deadline_ns)
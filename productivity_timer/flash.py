@@ -0,0 +1,95 @@
+"""Screen flash backends, imported on the first flash."""
+import queue
+import subprocess
+import threading
+import time
+import tkinter as tk
+
+class XrandrFlasher:
+    """Flashes the screen by dimming the primary output with xrandr.
+
+    The primary output is looked up once and cached. The cache is refreshed
+    when the screen geometry changes or a flash fails. Flashes run on a
+    single worker thread, so flash() never blocks the caller, and a flash
+    asked for while another is still running is dropped.
+    """
+    def __init__(self, duration=0.2):
+        self.duration = duration
+        self.primary_display = None
+        self._geometry = None
+        self._requests = queue.Queue(maxsize=1)
+        self._thread = None
+        # Set from flash() until the worker is done with that flash
+        self._busy = threading.Event()
+
+    def flash(self, geometry=None):
+        if self._busy.is_set():
+            return
+        self._busy.set()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+        self._requests.put_nowait(geometry)
+
+    def _worker(self):
+        while True:
+            geometry = self._requests.get()
+            try:
+                if self.primary_display is None or geometry != self._geometry:
+                    self.primary_display = self._find_primary_display()
+                    self._geometry = geometry
+                if self.primary_display:
+                    if self._set_brightness("0.1"):
+                        time.sleep(self.duration)
+                        self._set_brightness("1")
+                    else:
+                        # The output is gone, look it up again next time
+                        self.primary_display = None
+            except Exception:
+                # Silently fail if screen flashing doesn't work
+                pass
+            finally:
+                self._busy.clear()
+
+    def _find_primary_display(self):
+        output = subprocess.run(["xrandr", "--current"], capture_output=True, text=True).stdout
+        for line in output.split('\n'):
+            if " connected " in line and "primary" in line:
+                return line.split()[0]
+        return None
+
+    def _set_brightness(self, value):
+        result = subprocess.run(["xrandr", "--output", self.primary_display, "--brightness", value],
+                                capture_output=True)
+        return result.returncode == 0
+
+class TkOverlayFlasher:
+    """Flashes the screen with a dark borderless Tk window, without forking.
+
+    The overlay window is built once and only shown and hidden afterwards.
+    It runs on the Tk thread and must be called from it.
+    """
+    def __init__(self, root, duration=0.2):
+        self.root = root
+        self.duration = duration
+        self.overlay = tk.Toplevel(root, bg='black')
+        self.overlay.withdraw()
+        self.overlay.overrideredirect(True)
+        try:
+            self.overlay.attributes('-topmost', True)
+            self.overlay.attributes('-alpha', 0.8)
+        except tk.TclError:
+            pass
+        self._hide_id = None
+
+    def flash(self, geometry=None):
+        if self._hide_id is not None:
+            return
+        if geometry:
+            self.overlay.geometry(f"{geometry[0]}x{geometry[1]}+0+0")
+        self.overlay.deiconify()
+        self._hide_id = self.root.after(int(self.duration * 1000), self._hide)
+
+    def _hide(self):
+        self._hide_id = None
+        self.overlay.withdraw()
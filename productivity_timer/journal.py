@@ -0,0 +1,184 @@
+"""Append-only session journal under the data directory.
+
+Each event is one compact JSON line, for example
+
+    {"t":1760700000.0,"e":"start","mode":"work","len":3600}
+
+Lines are written by a background thread and fsynced in batches, so
+recording an event never blocks the tick. When the current file grows past
+max_bytes it is renamed to journal-000001.jsonl, journal-000002.jsonl, ...
+and read_journal() streams all of them back in order. Rotation keeps a
+file's place in that order, so read_journal_after() can pick up from a
+(file, byte offset) cursor.
+"""
+import glob
+import json
+import os
+import queue
+import threading
+import time
+
+JOURNAL_NAME = "journal.jsonl"
+ROTATED_PATTERN = "journal-*.jsonl"
+
+def _mode(is_work_period):
+    return "work" if is_work_period else "break"
+
+class SessionJournal:
+    def __init__(self, directory, max_bytes=1_000_000, fsync_interval=5.0, clock=time.time):
+        self.directory = directory
+        self.path = os.path.join(directory, JOURNAL_NAME)
+        self.max_bytes = max_bytes
+        self.fsync_interval = fsync_interval
+        self.clock = clock
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._closed = False
+
+    def record(self, event, **fields):
+        if self._closed:
+            return
+        entry = {"t": round(self.clock(), 3), "e": event}
+        entry.update(fields)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+        self._queue.put(entry)
+
+    def __call__(self, event, info):
+        # Engine listener: journal the events worth keeping, not the ticks
+        if info.get("skipped"):
+            # Nobody worked through these, the skip event below stands for them
+            return
+        if event == "skip" and info["periods"]:
+            # The period left when the machine was suspended ends there, and
+            # the one it woke up in counts only from now
+            self.record("stop", mode=_mode(info["interrupted"]), left=info["left"])
+            self.record("start", mode=_mode(info["is_work_period"]), len=info["remaining"])
+        elif event == "period_start":
+            self.record("start", mode=_mode(info["is_work_period"]), len=info["total"])
+        elif event == "period_complete":
+            self.record("complete", mode=_mode(info["is_work_period"]))
+        elif event == "stop":
+            self.record("stop", mode=_mode(info["is_work_period"]), left=info["remaining"])
+        elif event == "pause":
+            self.record("pause", mode=_mode(info["is_work_period"]), left=info["remaining"])
+        elif event == "resume":
+            self.record("resume", mode=_mode(info["is_work_period"]))
+        elif event == "reminder":
+            self.record("remind", when=info["notification"].describe(),
+                        late=round(info["lateness"], 3), msg=info["message"])
+
+    def close(self):
+        # Flush everything recorded so far and stop the writer
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+
+    def _worker(self):
+        handle = open(self.path, "a", encoding="utf-8")
+        dirty = False
+        last_sync = time.monotonic()
+        try:
+            while True:
+                try:
+                    entry = self._queue.get(timeout=self.fsync_interval)
+                except queue.Empty:
+                    entry = False
+                if entry:
+                    handle.write(json.dumps(entry, separators=(",", ":")) + "\n")
+                    dirty = True
+                    # Make the lines visible to readers, fsync stays batched
+                    if self._queue.empty():
+                        handle.flush()
+                if dirty and (entry is None or time.monotonic() - last_sync >= self.fsync_interval):
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                    dirty = False
+                    last_sync = time.monotonic()
+                if entry is None:
+                    return
+                if entry and handle.tell() >= self.max_bytes:
+                    handle = self._rotate(handle)
+        finally:
+            handle.close()
+
+    def _rotate(self, handle):
+        handle.flush()
+        os.fsync(handle.fileno())
+        handle.close()
+        os.replace(self.path, os.path.join(self.directory, f"journal-{_last_index(self.directory) + 1:06d}.jsonl"))
+        return open(self.path, "a", encoding="utf-8")
+
+def _rotated_files(directory):
+    return sorted(glob.glob(os.path.join(directory, ROTATED_PATTERN)))
+
+def _file_index(path):
+    return int(os.path.basename(path)[len("journal-"):-len(".jsonl")])
+
+def _last_index(directory):
+    files = _rotated_files(directory)
+    if not files:
+        return 0
+    return _file_index(files[-1])
+
+def _journal_files(directory):
+    # (index, path) oldest first; the current file is renamed to its own
+    # index when it is rotated
+    rotated = [(_file_index(path), path) for path in _rotated_files(directory)]
+    current = rotated[-1][0] + 1 if rotated else 1
+    return rotated + [(current, os.path.join(directory, JOURNAL_NAME))]
+
+def read_journal(directory, since=None):
+    """Yield journal entries oldest first, one file and one line at a time.
+
+    Files last modified before `since` (a time.time() value) are skipped
+    without being opened. A torn last line from a crash is ignored.
+    """
+    paths = _rotated_files(directory) + [os.path.join(directory, JOURNAL_NAME)]
+    for path in paths:
+        try:
+            if since is not None and os.path.getmtime(path) < since:
+                continue
+            handle = open(path, encoding="utf-8")
+        except OSError:
+            continue
+        with handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if since is None or entry["t"] >= since:
+                    yield entry
+
+def read_journal_after(directory, cursor=None):
+    """Entries written after `cursor`, and the cursor to pass next time.
+
+    A cursor is [file index, byte offset] of the first byte not read yet, so
+    every entry is read exactly once, however close together their times
+    are. A last line still missing its newline is left for the next call.
+    """
+    start_index, start_offset = cursor or (0, 0)
+    entries = []
+    for index, path in _journal_files(directory):
+        if index < start_index:
+            continue
+        offset = start_offset if index == start_index else 0
+        try:
+            with open(path, "rb") as handle:
+                handle.seek(offset)
+                data = handle.read()
+        except OSError:
+            continue
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        start_index, start_offset = index, offset + end
+    return entries, [start_index, start_offset]
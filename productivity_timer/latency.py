@@ -0,0 +1,97 @@
+"""Opt-in latency instrumentation, enabled with PRODUCTIVITY_TIMER_LATENCY=1.
+
+Every sample goes into a fixed-size ring buffer per channel, so recording
+costs the same however long the timer runs and memory never grows. The
+window keeps these channels:
+
+  tick_lateness  how long after its due time a root.after tick ran
+  redraw         time spent redrawing the progress bar on a tick
+  dispatch       time the Tk thread spent handing off a reminder and flash
+  delivery       time from submitting a notification until it was shown
+
+report() gives count, p50, p99 and max in milliseconds, plus a histogram,
+for the debug overlay, the control API's "latency" command and
+`python -m productivity_timer --latency`.
+"""
+import array
+
+# Upper bounds of the histogram buckets in milliseconds, the last is open
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+CHANNELS = ("tick_lateness", "redraw", "dispatch", "delivery")
+# Seconds between refreshes of the debug overlay; a report sorts every
+# sample, which costs more than the redraws it measures
+OVERLAY_INTERVAL = 1.0
+
+class LatencyRing:
+    """The last `size` samples of one measurement, in seconds."""
+    def __init__(self, size=1024):
+        self.samples = array.array("d", bytes(8 * size))
+        self.size = size
+        self.count = 0
+
+    def record(self, seconds):
+        self.samples[self.count % self.size] = seconds
+        self.count += 1
+
+    def values(self):
+        return self.samples[:min(self.count, self.size)].tolist()
+
+    def summary(self):
+        values = sorted(self.values())
+        if not values:
+            return {"count": 0}
+        histogram = [0] * (len(BUCKETS_MS) + 1)
+        bucket = 0
+        for value in values:
+            while bucket < len(BUCKETS_MS) and value * 1000 > BUCKETS_MS[bucket]:
+                bucket += 1
+            histogram[bucket] += 1
+        return {"count": len(values), "p50": _percentile(values, 50) * 1000,
+                "p99": _percentile(values, 99) * 1000, "max": values[-1] * 1000,
+                "histogram": histogram}
+
+def _percentile(ordered, percent):
+    # Nearest rank over an already sorted list
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+class LatencyMonitor:
+    def __init__(self, size=1024, channels=CHANNELS):
+        self.rings = {name: LatencyRing(size) for name in channels}
+
+    def record(self, channel, seconds):
+        self.rings[channel].record(seconds)
+
+    def report(self):
+        # channel -> summary, milliseconds throughout
+        report = {name: ring.summary() for name, ring in self.rings.items()}
+        report["buckets_ms"] = list(BUCKETS_MS)
+        return report
+
+def format_report(report):
+    # Text lines for a terminal, one per channel
+    buckets = report.get("buckets_ms", BUCKETS_MS)
+    labels = [f"<={bound}" for bound in buckets] + [f">{buckets[-1]}"]
+    lines = []
+    for name, summary in report.items():
+        if name == "buckets_ms":
+            continue
+        if not summary["count"]:
+            lines.append(f"{name:<14} no samples")
+            continue
+        lines.append(f"{name:<14} p50 {summary['p50']:8.2f} ms  p99 {summary['p99']:8.2f} ms  "
+                     f"max {summary['max']:8.2f} ms  ({summary['count']} samples)")
+        lines.append(" " * 15 + "  ".join(f"{label}:{count}" for label, count
+                                          in zip(labels, summary["histogram"]) if count))
+    return "\n".join(lines)
+
+def format_overlay(report):
+    # Short lines for the progress bar overlay, "name p50/p99 ms"
+    short = {"tick_lateness": "late", "redraw": "draw", "dispatch": "send",
+             "delivery": "shown"}
+    lines = []
+    for name, label in short.items():
+        summary = report.get(name)
+        if summary and summary["count"]:
+            lines.append(f"{label} {summary['p50']:.1f}/{summary['p99']:.1f} ms")
+    return "\n".join(lines)
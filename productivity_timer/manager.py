@@ -0,0 +1,120 @@
+import heapq
+import itertools
+import time
+
+from .engine import TimerEngine
+
+class TimerManager:
+    """Many named timers, each a TimerEngine, driven by one heap of deadlines.
+
+    Nothing runs between deadlines: the owner sleeps for next_delay()
+    seconds and then calls run_due(), or simply calls run(). Wakeups are
+    held back by up to `slack` seconds so that deadlines close together are
+    handled in one wakeup; timers are ticked slightly late, never early.
+
+    Every engine gets the manager's clock and wall_clock, so a simulated
+    clock comes with the wall clock to match and suspends are not misread.
+    """
+    def __init__(self, clock=time.monotonic, slack=0.005, wall_clock=time.time):
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.slack = slack
+        self.timers = {}
+        self.heap = []
+        self.counter = itertools.count()
+        # name -> sequence number of its live heap entry, older ones are stale
+        self.scheduled = {}
+        self.wakeups = 0
+
+    def add(self, name, work_seconds=3600, break_seconds=900, reminders=(), **engine_args):
+        if name in self.timers:
+            raise ValueError(f"there is already a timer called {name!r}")
+        engine = TimerEngine(work_seconds, break_seconds, clock=self.clock,
+                             wall_clock=self.wall_clock, **engine_args)
+        engine.set_reminders(reminders)
+        self.timers[name] = engine
+        return engine
+
+    def remove(self, name):
+        self.stop(name)
+        del self.timers[name]
+
+    def get(self, name):
+        return self.timers[name]
+
+    def names(self):
+        return list(self.timers)
+
+    def start(self, name):
+        engine = self.timers[name]
+        engine.start()
+        self._schedule(name, engine)
+
+    def stop(self, name):
+        self.timers[name].stop()
+        self.scheduled.pop(name, None)
+
+    def pause(self, name):
+        self.timers[name].pause()
+        self.scheduled.pop(name, None)
+
+    def resume(self, name):
+        engine = self.timers[name]
+        engine.resume()
+        self._schedule(name, engine)
+
+    def reset(self, name):
+        self.timers[name].reset()
+        self.scheduled.pop(name, None)
+
+    def running(self):
+        return [name for name, engine in self.timers.items() if engine.running]
+
+    def _schedule(self, name, engine):
+        delay = engine.next_delay()
+        if delay is None:
+            self.scheduled.pop(name, None)
+            return
+        sequence = next(self.counter)
+        self.scheduled[name] = sequence
+        heapq.heappush(self.heap, (self.clock() + delay, sequence, name))
+
+    def _drop_stale(self):
+        heap = self.heap
+        while heap and self.scheduled.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+
+    def next_delay(self):
+        # Seconds until the earliest timer needs a tick, None when none runs
+        self._drop_stale()
+        if not self.heap:
+            return None
+        return max(0.0, self.heap[0][0] + self.slack - self.clock())
+
+    def run_due(self):
+        """Ticks every timer whose deadline has come, returns how many."""
+        self.wakeups += 1
+        now = self.clock()
+        heap = self.heap
+        ticked = 0
+        while heap and heap[0][0] <= now:
+            _, sequence, name = heapq.heappop(heap)
+            if self.scheduled.get(name) != sequence:
+                continue
+            engine = self.timers[name]
+            engine.tick()
+            self._schedule(name, engine)
+            ticked += 1
+        return ticked
+
+    def run(self, sleep=time.sleep, until=None):
+        # Blocks until no timer is running, or until clock() reaches `until`
+        while True:
+            delay = self.next_delay()
+            if delay is None:
+                return
+            if until is not None and self.clock() + delay > until:
+                return
+            if delay > 0:
+                sleep(delay)
+            self.run_due()
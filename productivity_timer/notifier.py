@@ -0,0 +1,103 @@
+import collections
+import threading
+import time
+
+class NotificationDispatcher:
+    """Delivers notifications from a small pool of worker threads.
+
+    submit() never blocks the caller. Messages submitted within the same
+    coalescing window are merged into one notification, and a failed
+    delivery is retried with exponential backoff before it is handed to the
+    fallback. The queue is bounded; overflowing messages are dropped.
+    """
+    def __init__(self, send, fallback, workers=2, maxsize=100, retries=2,
+                 backoff=0.5, coalesce_window=1.0, clock=time.monotonic, observe=None,
+                 sleep=time.sleep):
+        self.send = send
+        self.fallback = fallback
+        self.workers = workers
+        self.maxsize = maxsize
+        self.retries = retries
+        self.backoff = backoff
+        self.coalesce_window = coalesce_window
+        self.clock = clock
+        # Waits out the backoff between retries
+        self.sleep = sleep
+        # Optional observe(latency), called for every delivery or fallback
+        self.observe = observe
+        self._pending = collections.deque()
+        self._cond = threading.Condition()
+        self._threads = []
+        # Counters, see stats()
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def submit(self, message):
+        if self.send is None:
+            self.fallback(message)
+            return
+        with self._cond:
+            if len(self._pending) >= self.maxsize:
+                self.dropped += 1
+                return
+            self._pending.append((self.clock(), message))
+            # Workers are started on first use
+            if not self._threads:
+                for _ in range(self.workers):
+                    thread = threading.Thread(target=self._worker, daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            sent = self.delivered + self.failed
+            return {
+                "queue_depth": len(self._pending),
+                "delivered": self.delivered,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "coalesced": self.coalesced,
+                "latency_avg": self.latency_total / sent if sent else 0.0,
+                "latency_max": self.latency_max,
+            }
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                submitted, message = self._pending.popleft()
+                messages = [message]
+                # Merge a burst of reminders that landed together
+                while self._pending and self._pending[0][0] - submitted < self.coalesce_window:
+                    messages.append(self._pending.popleft()[1])
+                self.coalesced += len(messages) - 1
+            self._deliver(submitted, "\n".join(messages))
+
+    def _deliver(self, submitted, message):
+        delivered = False
+        for attempt in range(self.retries + 1):
+            try:
+                self.send(message)
+                delivered = True
+                break
+            except Exception:
+                if attempt < self.retries:
+                    self.sleep(self.backoff * 2 ** attempt)
+        if not delivered:
+            self.fallback(message)
+        latency = self.clock() - submitted
+        with self._cond:
+            if delivered:
+                self.delivered += 1
+            else:
+                self.failed += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            if self.observe:
+                self.observe(latency)
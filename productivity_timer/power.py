@@ -0,0 +1,35 @@
+"""Power saving for a timer nobody is looking at.
+
+While the window is visible the timer wakes up once a second to redraw.
+When it is hidden nothing on screen changes, so it only needs to wake up
+when a reminder fires or the period ends; the monotonic deadline lets the
+display catch up at once when the window comes back.
+"""
+import collections
+import time
+
+def tick_delay(engine, visible):
+    # Seconds until the owner should call engine.tick() again, None when stopped
+    return engine.next_delay() if visible else engine.next_event_delay()
+
+class WakeupMeter:
+    """Counts timer wakeups over a sliding window, reported per minute."""
+    def __init__(self, window=60.0, clock=time.monotonic):
+        self.window = window
+        self.clock = clock
+        self.times = collections.deque()
+        self.total = 0
+
+    def record(self):
+        now = self.clock()
+        self.times.append(now)
+        self.total += 1
+        self._expire(now)
+
+    def _expire(self, now):
+        while self.times and self.times[0] <= now - self.window:
+            self.times.popleft()
+
+    def per_minute(self):
+        self._expire(self.clock())
+        return len(self.times) * 60.0 / self.window
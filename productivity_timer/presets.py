@@ -0,0 +1,112 @@
+"""Named presets of durations and reminders, kept in presets.json.
+
+The file carries a schema version. Older versions are upgraded on load
+through MIGRATIONS, and every save goes through an atomic rename, so a
+crash never leaves a half-written file behind.
+
+Besides the named presets the file keeps the settings the window was
+closed with under "last", so closing never overwrites a named preset.
+"""
+import json
+import os
+
+from .reminders import NotificationEntry
+from .storage import atomic_write
+
+PRESETS_NAME = "presets.json"
+SCHEMA_VERSION = 1
+DEFAULT_PRESET = "Default"
+DEFAULT_WORK = "60"
+DEFAULT_BREAK = "15"
+
+# version -> function upgrading a document of that version by one step, none yet
+MIGRATIONS = {}
+
+class Preset:
+    def __init__(self, work=DEFAULT_WORK, break_=DEFAULT_BREAK, reminders=()):
+        # Durations are kept as typed in the entry fields
+        self.work = work
+        self.break_ = break_
+        self.reminders = list(reminders)
+
+    def to_json(self):
+        return {"work": self.work, "break": self.break_,
+                "reminders": [notif.to_json() for notif in self.reminders]}
+
+    @classmethod
+    def from_json(cls, data):
+        # A reminder that could never fire makes the whole file unreadable
+        reminders = [NotificationEntry.from_json(item).check()
+                     for item in data.get("reminders", [])]
+        return cls(str(data.get("work", DEFAULT_WORK)), str(data.get("break", DEFAULT_BREAK)),
+                   reminders)
+
+class PresetStore:
+    def __init__(self, directory):
+        self.path = os.path.join(directory, PRESETS_NAME)
+        self.presets = {}
+        # Name of the preset last loaded or saved, None once it is deleted
+        self.current = DEFAULT_PRESET
+        # Settings the window was last closed with, a Preset or None
+        self.last = None
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                data = json.load(handle)
+            data = migrate(data)
+            current = data.get("current", DEFAULT_PRESET)
+            presets = {name: Preset.from_json(preset)
+                       for name, preset in data.get("presets", {}).items()}
+            last = data.get("last")
+            last = None if last is None else Preset.from_json(last)
+        except FileNotFoundError:
+            return self
+        except (ValueError, TypeError, AttributeError, KeyError):
+            # Keep an unreadable file around instead of overwriting it
+            os.replace(self.path, self.path + ".bad")
+            return self
+        self.current = current
+        self.presets = presets
+        self.last = last
+        return self
+
+    def save(self):
+        data = {"version": SCHEMA_VERSION, "current": self.current,
+                "presets": {name: preset.to_json() for name, preset in self.presets.items()}}
+        if self.last is not None:
+            data["last"] = self.last.to_json()
+        atomic_write(self.path, json.dumps(data, separators=(",", ":")).encode("utf-8"))
+
+    def names(self):
+        return sorted(self.presets)
+
+    def get(self, name):
+        return self.presets.get(name)
+
+    def put(self, name, preset):
+        self.presets[name] = preset
+        self.current = name
+
+    def delete(self, name):
+        self.presets.pop(name, None)
+        if self.current == name:
+            self.current = None
+
+    def startup_preset(self):
+        # What the window opens with: the settings it was closed with, or
+        # the last used preset for files saved before "last" existed
+        return self.last or self.presets.get(self.current)
+
+def migrate(data):
+    version = data.get("version")
+    if not isinstance(version, int) or version < 1:
+        raise ValueError(f"unknown presets file version {version!r}")
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"presets file version {version} is newer than this timer")
+    while version < SCHEMA_VERSION:
+        if version not in MIGRATIONS:
+            raise ValueError(f"presets file version {version} cannot be upgraded")
+        data = MIGRATIONS[version](data)
+        version = data["version"]
+    return data
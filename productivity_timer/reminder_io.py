@@ -0,0 +1,183 @@
+"""Bulk import and export of reminders as CSV or JSON.
+
+CSV has one WHEN,MESSAGE row per reminder, with an optional header row,
+where WHEN is anything parse_when reads ("50", "+10m", "@14:30", ...).
+JSON is either an array or one value per line, where each value is a
+[percent, message] pair or an object as written by NotificationEntry.to_json.
+Input is parsed as a stream, so packs of any size are read chunk by chunk.
+"""
+import csv
+import json
+
+from .reminders import NotificationEntry, parse_when
+
+CHUNK_SIZE = 64 * 1024
+HEADER_NAMES = {"percentage", "percent", "%", "when"}
+
+class ImportResult:
+    def __init__(self):
+        self.entries = []
+        self.duplicates = 0
+        # (row number, reason) for every rejected row
+        self.errors = []
+
+def validate(when, message):
+    # Returns a checked NotificationEntry, or raises ValueError saying what is wrong
+    return NotificationEntry(message=str(message).strip(), **parse_when(str(when))).check()
+
+def _detect_format(stream, name=None):
+    # The file extension wins, otherwise the first character decides
+    if name and name.lower().endswith((".json", ".jsonl")):
+        return "json"
+    if name and name.lower().endswith(".csv"):
+        return "csv"
+    head = stream.peek_char()
+    return "json" if head in "[{" else "csv"
+
+class _PeekableStream:
+    # Lets detect_format look at the first non-blank character of stdin
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = ""
+
+    def peek_char(self):
+        while not self.buffer.strip():
+            chunk = self.stream.read(CHUNK_SIZE)
+            if not chunk:
+                return ""
+            self.buffer += chunk
+        return self.buffer.lstrip()[0]
+
+    def read(self, size=-1):
+        if self.buffer:
+            data, self.buffer = self.buffer, ""
+            return data
+        return self.stream.read(size)
+
+    def __iter__(self):
+        # Line iteration for the csv module
+        pending = ""
+        while True:
+            chunk = self.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            lines = (pending + chunk).split("\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line + "\n"
+        if pending:
+            yield pending
+
+def _csv_rows(stream):
+    for number, row in enumerate(csv.reader(stream), start=1):
+        if not row or not "".join(row).strip():
+            continue
+        if number == 1 and row[0].strip().lower() in HEADER_NAMES:
+            continue
+        if len(row) < 2:
+            yield number, ValueError("expected WHEN,MESSAGE")
+            continue
+        # Commas in an unquoted message are kept
+        yield number, (row[0], ",".join(row[1:]))
+
+def _json_values(stream):
+    # Decodes one value at a time, either the items of a top-level array of
+    # pairs/objects or a sequence of values such as JSON lines
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    in_array = None
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if in_array is None and position < len(buffer):
+            # "[[" or "[{" opens an array of reminders, a lone "[" is a pair
+            rest = buffer[position + 1:].lstrip()
+            if buffer[position] != "[":
+                in_array = False
+            elif rest or eof:
+                in_array = rest[:1] in ("[", "{", "]")
+                if in_array:
+                    position += 1
+                continue
+        elif in_array and position < len(buffer) and buffer[position] in ",]":
+            position += 1
+            continue
+        if position < len(buffer) and in_array is not None:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except ValueError:
+                if eof:
+                    raise
+            else:
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(buffer) or eof or not isinstance(value, (int, float)):
+                    yield value
+                    position = end
+                    continue
+        elif eof:
+            return
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            eof = True
+        buffer = buffer[position:] + chunk
+        position = 0
+
+def _json_rows(stream):
+    number = 0
+    for value in _json_values(stream):
+        # A preset or export file wraps the list in {"reminders": [...]}
+        items = value["reminders"] if isinstance(value, dict) and "reminders" in value else [value]
+        for item in items:
+            number += 1
+            if isinstance(item, (dict, list)) and (isinstance(item, dict) or len(item) == 2):
+                yield number, item
+            else:
+                yield number, ValueError("expected [percent, message]")
+
+def read_reminders(stream, name=None, existing=()):
+    """Parse reminders from a text stream into an ImportResult.
+
+    Invalid rows are collected in result.errors instead of stopping the
+    import. Reminders already in `existing`, or repeated in the input,
+    are counted in result.duplicates and left out.
+    """
+    stream = _PeekableStream(stream)
+    rows = _json_rows(stream) if _detect_format(stream, name) == "json" else _csv_rows(stream)
+    seen = {notif.key() for notif in existing}
+    result = ImportResult()
+    try:
+        for number, row in rows:
+            if isinstance(row, ValueError):
+                result.errors.append((number, str(row)))
+                continue
+            try:
+                if isinstance(row, tuple):
+                    notif = validate(*row)
+                else:
+                    notif = NotificationEntry.from_json(row)
+                    notif.message = str(notif.message).strip()
+                    notif.check()
+            except (TypeError, ValueError) as e:
+                result.errors.append((number, str(e)))
+                continue
+            key = notif.key()
+            if key in seen:
+                result.duplicates += 1
+                continue
+            seen.add(key)
+            result.entries.append(notif)
+    except ValueError as e:
+        # Broken JSON, everything before it is kept
+        result.errors.append((None, f"invalid JSON: {e}"))
+    return result
+
+def write_reminders(notifications, stream, fmt="csv"):
+    if fmt == "json":
+        json.dump([notif.to_json() for notif in notifications], stream, indent=1)
+        stream.write("\n")
+    else:
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(["when", "message"])
+        writer.writerows([notif.describe(), notif.message] for notif in notifications)
@@ -0,0 +1,328 @@
+import heapq
+import itertools
+import math
+import re
+import time
+
+from .durations import format_duration_spec, parse_duration
+
+DURING = ("work", "break", "any")
+# Shortest repeat interval, anything faster is noise rather than a reminder
+MIN_EVERY = 1.0
+
+class NotificationEntry:
+    """One reminder. Exactly one of these says when it fires:
+
+      percentage  share of the period, 0-100
+      offset      seconds after the period started
+      at          wall-clock time of day, in seconds after midnight
+      every       seconds between repeats, counted from when the timer started
+
+    during is "work", "break" or "any". Reminders tied to the period
+    default to work periods, clock and recurring ones to any period.
+    """
+    def __init__(self, percentage=None, message="", offset=None, at=None, every=None,
+                 during=None):
+        self.percentage = percentage
+        self.message = message
+        self.offset = offset
+        self.at = at
+        self.every = every
+        self.during = during or ("work" if self.period_relative else "any")
+        self.triggered = False  # To track if notification has been fired
+
+    @property
+    def period_relative(self):
+        return self.at is None and self.every is None
+
+    def fires_in(self, is_work_period):
+        return self.during == "any" or (self.during == "work") == is_work_period
+
+    def check(self):
+        # Raises ValueError if the reminder can never make sense
+        triggers = [value for value in (self.percentage, self.offset, self.at, self.every)
+                    if value is not None]
+        if len(triggers) != 1:
+            raise ValueError("a reminder needs exactly one of percentage, offset, at or every")
+        if any(not math.isfinite(value) for value in triggers):
+            raise ValueError("reminder times must be finite")
+        if self.percentage is not None and not 0 <= self.percentage <= 100:
+            raise ValueError(f"percentage {self.percentage:g} is outside 0-100")
+        if self.offset is not None and self.offset < 0:
+            raise ValueError("offsets cannot be negative")
+        if self.at is not None and not 0 <= self.at < 86400:
+            raise ValueError("times of day must be between 00:00 and 23:59")
+        if self.every is not None and self.every < MIN_EVERY:
+            raise ValueError(f"the repeat interval must be at least {MIN_EVERY:g}s")
+        if self.during not in DURING:
+            raise ValueError(f"during must be one of {', '.join(DURING)}")
+        if not str(self.message).strip():
+            raise ValueError("empty message")
+        return self
+
+    def describe(self):
+        # The same notation parse_when reads, "50%", "+10m", "@14:30", "every 20m"
+        if self.offset is not None:
+            text = "+" + format_duration_spec(self.offset)
+        elif self.at is not None:
+            hours, minutes = divmod(int(self.at) // 60, 60)
+            text = f"@{hours:02d}:{minutes:02d}"
+        elif self.every is not None:
+            text = "every " + format_duration_spec(self.every)
+        else:
+            text = f"{self.percentage}%"
+        default = "work" if self.period_relative else "any"
+        return text if self.during == default else f"{text} during {self.during}"
+
+    def key(self):
+        # Two reminders with the same key are duplicates
+        return (self.percentage, self.offset, self.at, self.every, self.during, self.message)
+
+    def to_json(self):
+        # Plain [percentage, message] pairs stay readable by older versions
+        if self.percentage is not None and self.during == "work":
+            return [self.percentage, self.message]
+        data = {name: getattr(self, name) for name in ("percentage", "offset", "at", "every")
+                if getattr(self, name) is not None}
+        data["message"] = self.message
+        data["during"] = self.during
+        return data
+
+    @classmethod
+    def from_json(cls, data):
+        if isinstance(data, list):
+            percentage, message = data
+            return cls(float(percentage), message)
+        at = data.get("at")
+        if isinstance(at, str):
+            at = parse_time_of_day(at)
+        return cls(_number(data.get("percentage")), data.get("message", ""),
+                   offset=_number(data.get("offset")), at=_number(at),
+                   every=_number(data.get("every")), during=data.get("during"))
+
+def _number(value):
+    return None if value is None else float(value)
+
+def parse_time_of_day(text):
+    hours, _, minutes = text.strip().partition(":")
+    hours, minutes = int(hours), int(minutes or 0)
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"invalid time of day {text!r}")
+    return hours * 3600 + minutes * 60
+
+_WHEN = re.compile(r"^\s*(?P<trigger>.+?)(?:\s+during\s+(?P<during>work|break|any))?\s*$",
+                   re.IGNORECASE)
+# A trigger followed by ":" and the message; "@14:30" has a colon of its own
+_SPEC = re.compile(r"^\s*(?P<when>(?:@\s*\d{1,2}:\d{2}|[^:@])[^:]*?)\s*:(?P<message>.*)$")
+
+def parse_when(text):
+    """Keyword arguments for NotificationEntry from a trigger like "50%",
+    "50", "+10m", "+90s", "@14:30" or "every 20m", optionally followed by
+    "during work", "during break" or "during any"."""
+    match = _WHEN.match(text)
+    if not match:
+        raise ValueError("empty reminder time")
+    trigger = match.group("trigger").strip().lower()
+    during = match.group("during") and match.group("during").lower()
+    if trigger.startswith("@"):
+        return {"at": parse_time_of_day(trigger[1:]), "during": during}
+    if trigger.startswith("every"):
+        return {"every": parse_duration(trigger[5:]), "during": during}
+    if trigger.startswith("+"):
+        return {"offset": parse_duration(trigger[1:]), "during": during}
+    return {"percentage": float(trigger.rstrip("%").strip()), "during": during}
+
+def parse_reminder_spec(text):
+    # "every 20m:Drink water" -> NotificationEntry, raises ValueError
+    match = _SPEC.match(text)
+    if not match:
+        raise ValueError(f"expected WHEN:MESSAGE, got {text!r}")
+    return NotificationEntry(message=match.group("message").strip(),
+                             **parse_when(match.group("when"))).check()
+
+def next_time_of_day(at, after):
+    # The first time.time() value later than `after` at which the local
+    # clock reads `at` seconds past midnight
+    day = time.localtime(after)
+    for extra_days in (0, 1, 2):
+        midnight = time.mktime((day.tm_year, day.tm_mon, day.tm_mday + extra_days,
+                                0, 0, 0, 0, 0, -1))
+        if midnight + at > after:
+            return midnight + at
+    raise ValueError("no such time of day")
+
+class ReminderQueue:
+    """Pending reminders of a running timer, in heaps ordered by the time
+    they fire at.
+
+    Each reminder has at most one entry. Reminders tied to the period are
+    pushed when a period starts, clock and recurring ones are pushed again
+    after they fire, so each event costs O(log n) no matter how long the
+    session runs. Entries of a finished period are dropped lazily when they
+    come up.
+
+    Period and recurring reminders are kept in active time, clock() minus
+    the time spent paused, so pause() and resume() cost O(1) and nothing
+    that already fired fires again. Reminders set for a time of day stay on
+    clock() time in a heap of their own; those that went by during a pause
+    are skipped.
+    """
+    def __init__(self, clock=time.monotonic, wall_clock=time.time):
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.heap = []
+        self.clock_heap = []
+        self.counter = itertools.count()
+        self.session_start = None
+        # Bumped at every period start, entries of older periods are stale
+        self.period = 0
+        self.period_start = None
+        self.period_total = None
+        self.is_work_period = True
+        self.paused_total = 0.0
+        self.paused_at = None
+
+    def _active(self, now):
+        # A pause in progress counts too, active time stands still during it
+        if self.paused_at is not None:
+            now = min(now, self.paused_at)
+        return now - self.paused_total
+
+    def start_session(self, notifications, now, started=None):
+        # started: when a restored session began, recurring reminders count from it
+        self.paused_total = 0.0
+        self.paused_at = None
+        self.session_start = now if started is None else started
+        self.heap = []
+        self.clock_heap = []
+        for notif in notifications:
+            if not notif.period_relative:
+                self._push_next(notif, now)
+
+    def start_period(self, is_work_period, start, total, notifications):
+        self.period += 1
+        self.is_work_period = is_work_period
+        self.period_start = self._active(start)
+        self.period_total = total
+        for notif in notifications:
+            if notif.period_relative:
+                self._push_in_period(notif, self.period_start)
+
+    def add(self, notif, now):
+        # Reminders added mid-period for a time already passed are skipped
+        if notif.period_relative:
+            if self.period_start is not None:
+                self._push_in_period(notif, self._active(now))
+        else:
+            self._push_next(notif, now)
+
+    def rebuild(self, notifications, now):
+        self.clear()
+        for notif in notifications:
+            self.add(notif, now)
+
+    def clear(self):
+        self.heap = []
+        self.clock_heap = []
+
+    def pause(self, now):
+        if self.paused_at is None:
+            self.paused_at = now
+
+    def resume(self, now):
+        if self.paused_at is None:
+            return
+        self.paused_total += now - self.paused_at
+        self.paused_at = None
+        while self.clock_heap and self.clock_heap[0][0] < now:
+            notif = heapq.heappop(self.clock_heap)[3]
+            self._push_next(notif, now)
+
+    def elapsed(self, now):
+        # Active seconds since the session started
+        return self._active(now) - self.session_start
+
+    def skip(self, seconds, now):
+        # clock() stood still for `seconds` that really went by, e.g. while the
+        # machine was suspended. Active time catches up, and reminders that
+        # came due meanwhile are dropped rather than fired all at once.
+        self.paused_total -= seconds
+        # Shifting every entry by the same amount keeps the heap in order
+        self.clock_heap = [(deadline - seconds, count, period, notif, repeat)
+                           for deadline, count, period, notif, repeat in self.clock_heap]
+        active = self._active(now)
+        while self.heap and self.heap[0][0] <= active:
+            _, _, period, notif, repeat = heapq.heappop(self.heap)
+            if period is None:
+                self._push_next(notif, now, repeat)
+            elif period == self.period:
+                notif.triggered = True
+        while self.clock_heap and self.clock_heap[0][0] <= now:
+            self._push_next(heapq.heappop(self.clock_heap)[3], now)
+
+    def _push(self, heap, deadline, notif, period, repeat=None):
+        heapq.heappush(heap, (deadline, next(self.counter), period, notif, repeat))
+
+    def _push_in_period(self, notif, not_before):
+        # not_before is in active time
+        if notif.triggered or not notif.fires_in(self.is_work_period):
+            return
+        if notif.percentage is not None:
+            delay = notif.percentage / 100 * self.period_total
+        else:
+            delay = notif.offset
+        deadline = self.period_start + delay
+        if delay <= self.period_total and deadline >= not_before:
+            self._push(self.heap, deadline, notif, self.period)
+
+    def _push_next(self, notif, after, fired=0):
+        # Clock and recurring reminders belong to the whole session
+        if notif.every is not None:
+            # The next repeat after `after`, and always one later than the
+            # repeat that just fired however the division rounds; repeats
+            # missed in a stall are skipped. Repeat n is due n * every after
+            # the start, the product taken in whole nanoseconds so it does
+            # not drift as n grows.
+            count = math.floor((self._active(after) - self.session_start) / notif.every) + 1
+            repeat = max(count, fired + 1)
+            every_ns = round(notif.every * 1e9)
+            self._push(self.heap, self.session_start + repeat * every_ns / 1e9, notif, None,
+                       repeat)
+        else:
+            # Found on the wall clock, then moved onto the monotonic clock
+            now, wall_now = self.clock(), self.wall_clock()
+            deadline = now + next_time_of_day(notif.at, wall_now + (after - now)) - wall_now
+            self._push(self.clock_heap, deadline, notif, None)
+
+    def peek(self):
+        # (clock() deadline, notification) of the next reminder, None if there is none
+        heap = self.heap
+        while heap and heap[0][2] is not None and heap[0][2] != self.period:
+            heapq.heappop(heap)
+        upcoming = None
+        if heap:
+            upcoming = (heap[0][0] + self.paused_total, heap[0][3])
+        if self.clock_heap and (upcoming is None or self.clock_heap[0][0] < upcoming[0]):
+            upcoming = (self.clock_heap[0][0], self.clock_heap[0][3])
+        return upcoming
+
+    def due(self, now):
+        """Pops every reminder due at `now`, as (notification, lateness) pairs."""
+        fired = []
+        active = self._active(now)
+        while self.heap and self.heap[0][0] <= active:
+            deadline, _, period, notif, repeat = heapq.heappop(self.heap)
+            if period is None:
+                self._push_next(notif, max(now, deadline + self.paused_total), repeat)
+                if notif.fires_in(self.is_work_period):
+                    fired.append((deadline, notif, active - deadline))
+            elif period == self.period:
+                fired.append((deadline, notif, active - deadline))
+        while self.clock_heap and self.clock_heap[0][0] <= now:
+            deadline, _, _, notif, _ = heapq.heappop(self.clock_heap)
+            self._push_next(notif, max(now, deadline))
+            if notif.fires_in(self.is_work_period):
+                fired.append((self._active(deadline), notif, now - deadline))
+        # In the order they were due, across both heaps
+        fired.sort(key=lambda item: item[0])
+        return [(notif, lateness) for _, notif, lateness in fired]
@@ -0,0 +1,120 @@
+import time
+
+NS = 1_000_000_000
+# Tick resolutions in seconds; "adaptive" picks one from the period length
+MIN_RESOLUTION = 0.1
+ADAPTIVE = "adaptive"
+# Steps adaptive resolution chooses from, each divides a second
+ADAPTIVE_STEPS = (1.0, 0.5, 0.25, 0.2, 0.1)
+
+def ns_clock(clock):
+    # An integer nanosecond version of a clock() returning float seconds
+    if clock is time.monotonic:
+        return time.monotonic_ns
+    # Simulated clocks may count in nanoseconds themselves
+    if hasattr(clock, "ns"):
+        return clock.ns
+    return lambda: round(clock() * NS)
+
+def to_ns(seconds):
+    return round(seconds * NS)
+
+def from_ns(ns):
+    # Whole numbers of seconds stay ints, so they print as "600" and not "600.0"
+    return ns // NS if ns % NS == 0 else ns / NS
+
+def parse_resolution(value):
+    """A tick resolution from settings: "adaptive" or seconds, at least 0.1."""
+    if str(value).strip().lower() == ADAPTIVE:
+        return ADAPTIVE
+    seconds = float(value)
+    if not seconds >= MIN_RESOLUTION:
+        raise ValueError(f"the tick resolution must be at least {MIN_RESOLUTION}s or adaptive")
+    return seconds
+
+class TickScheduler:
+    """Countdown for a single period, measured against a monotonic deadline.
+
+    The remaining time is recomputed from the deadline on every tick, so slow
+    notifications or redraws never stretch the period, and a tick that comes
+    in late simply catches up to the correct second. Pausing freezes the
+    remaining time and resuming moves the deadline, both in O(1).
+
+    Deadlines and remaining time are integer nanoseconds, so rounding to the
+    displayed second is exact however long the timer runs.
+
+    start_ns, in clock_ns() time, lets a period begin exactly where the one
+    before it ended rather than at the tick that noticed, so lateness does
+    not pile up over a session.
+    """
+    def __init__(self, seconds, clock=time.monotonic, remaining=None, resolution=1.0,
+                 start_ns=None):
+        self.clock = clock
+        self.clock_ns = ns_clock(clock)
+        self.total_ns = to_ns(seconds)
+        if self.total_ns <= 0:
+            # Nothing to count down, and progress would divide by zero
+            raise ValueError("the period must be longer than 0s")
+        self.resolution = resolution
+        if start_ns is None:
+            start_ns = self.clock_ns()
+        # A restored period starts part way through
+        self.deadline_ns = start_ns + (self.total_ns if remaining is None
+                                       else to_ns(remaining))
+        # Remaining nanoseconds while paused, None while counting down
+        self.paused_ns = None
+
+    @property
+    def total_seconds(self):
+        return from_ns(self.total_ns)
+
+    @property
+    def deadline(self):
+        # In clock() seconds
+        return self.deadline_ns / NS
+
+    def remaining_ns(self):
+        if self.paused_ns is not None:
+            return self.paused_ns
+        return max(0, self.deadline_ns - self.clock_ns())
+
+    def remaining(self):
+        return self.remaining_ns() / NS
+
+    def remaining_seconds(self):
+        # Round up so "00:00" is only shown once the deadline has passed
+        return -(-self.remaining_ns() // NS)
+
+    def expired(self):
+        return self.remaining_ns() <= 0
+
+    def pause(self):
+        if self.paused_ns is None:
+            self.paused_ns = self.remaining_ns()
+
+    def resume(self):
+        if self.paused_ns is not None:
+            self.deadline_ns = self.clock_ns() + self.paused_ns
+            self.paused_ns = None
+
+    def skip(self, seconds):
+        self.deadline_ns -= to_ns(seconds)
+
+    def step_ns(self):
+        # Ticks land on multiples of the resolution before the deadline
+        if self.resolution == ADAPTIVE:
+            # About one tick per tenth of a degree of the progress arc, but
+            # at least once a second for the clock and at most every 100 ms
+            arc_step = self.total_ns / NS / 3600
+            step = next((step for step in ADAPTIVE_STEPS if step <= arc_step), MIN_RESOLUTION)
+        else:
+            step = max(MIN_RESOLUTION, self.resolution)
+        return to_ns(step)
+
+    def next_delay(self):
+        # Sleep only until the remaining time crosses the next step
+        remaining = self.remaining_ns()
+        if remaining <= 0:
+            return 0.0
+        step = self.step_ns()
+        return (remaining % step or step) / NS
@@ -0,0 +1,104 @@
+"""Deterministic simulation of the timer on a virtual clock.
+
+The engine already takes its clocks as arguments, so a simulation only
+needs a clock that jumps instead of waiting. simulate() runs a session
+from one event to the next, periods ending and reminders firing, and
+returns the trace of what happened and when. Days of cycles take
+milliseconds, and the same arguments always give the same trace, which
+makes a saved trace a regression check:
+
+    python -m productivity_timer --work 60 --break 15 --remind "50:Drink water" \\
+        --simulate 2d > expected.txt
+    python -m productivity_timer ... --simulate 2d --expect expected.txt
+
+Times of day are placed in the local time zone, starting from midnight
+local time, so traces with @HH:MM reminders agree across time zones.
+"""
+import math
+import time
+
+from .engine import TimerEngine
+from .scheduler import NS, to_ns
+
+class VirtualClock:
+    """A monotonic clock in integer nanoseconds that only moves when told to,
+    with a wall clock moving in step."""
+    def __init__(self, wall_start=None):
+        self.now_ns = 0
+        if wall_start is None:
+            wall_start = time.mktime((2024, 1, 1, 0, 0, 0, 0, 0, -1))
+        self.wall_start = wall_start
+
+    def __call__(self):
+        return self.now_ns / NS
+
+    def ns(self):
+        return self.now_ns
+
+    def wall(self):
+        return self.wall_start + self.now_ns / NS
+
+    def advance(self, seconds):
+        # Rounded up, so a deadline between two nanoseconds is reached
+        self.now_ns += max(0, math.ceil(seconds * NS))
+
+class TraceEvent:
+    def __init__(self, at, event, detail):
+        # at: seconds since the start of the simulation
+        self.at = at
+        self.event = event
+        self.detail = detail
+
+    def __str__(self):
+        return f"{format_offset(self.at)}  {self.event:<15} {self.detail}".rstrip()
+
+def format_offset(seconds):
+    # 93784.5 -> "1d 02:03:04.500"
+    millis = round(seconds * 1000)
+    days, millis = divmod(millis, 86400000)
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{days}d {hours:02d}:{minutes:02d}:{secs:02d}.{millis:03d}"
+
+def _detail(event, info):
+    mode = "work" if info.get("is_work_period", True) else "break"
+    if event == "period_start":
+        return f"{mode} {info['total']}s"
+    if event == "period_complete":
+        return mode
+    if event == "reminder":
+        return f"{info['notification'].describe()} {info['message']!r} late {info['lateness']:.3f}s"
+    if event in ("pause", "resume", "stop"):
+        return f"{mode} {info['remaining']}s left"
+    if event == "tick":
+        return f"{mode} {info['time_text']} {info['progress']:.1f}%"
+    return " ".join(f"{key}={value}" for key, value in sorted(info.items()))
+
+def simulate(work_seconds, break_seconds, reminders=(), duration=86400, resolution=1.0,
+             ticks=False, clock=None):
+    """Runs a session for `duration` simulated seconds and returns its trace,
+    a list of TraceEvent. With ticks=True every display tick is traced too,
+    otherwise the clock jumps straight from one event to the next."""
+    clock = clock or VirtualClock()
+    engine = TimerEngine(work_seconds, break_seconds, clock=clock, wall_clock=clock.wall,
+                         resolution=resolution)
+    engine.set_reminders(reminders)
+    start = clock()
+    trace = []
+    def record(event, info):
+        if event == "tick" and not ticks or event == "reminders":
+            return
+        trace.append(TraceEvent(clock() - start, event, _detail(event, info)))
+    engine.add_listener(record)
+    engine.start()
+    end_ns = clock.ns() + to_ns(duration)
+    while engine.running:
+        delay = engine.next_delay() if ticks else engine.next_event_delay()
+        if clock.ns() + math.ceil(delay * NS) > end_ns:
+            break
+        clock.advance(delay)
+        engine.tick()
+    clock.now_ns = max(clock.now_ns, end_ns)
+    engine.stop()
+    return trace
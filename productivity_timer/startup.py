@@ -0,0 +1,47 @@
+"""Opt-in startup trace, enabled with PRODUCTIVITY_TIMER_TRACE.
+
+PRODUCTIVITY_TIMER_TRACE=1 prints the time spent in each startup phase to
+stderr, PRODUCTIVITY_TIMER_TRACE=json prints the same numbers as one JSON
+line so they can be collected and compared across releases.
+"""
+import json
+import os
+import sys
+import time
+
+class StartupTrace:
+    def __init__(self, started=None, mode=None, out=None):
+        self.mode = mode if mode is not None else os.environ.get("PRODUCTIVITY_TIMER_TRACE")
+        self.out = out or sys.stderr
+        self.started = started if started is not None else time.perf_counter()
+        self.last = self.started
+        self.phases = []
+        self.done = False
+
+    @property
+    def enabled(self):
+        return bool(self.mode)
+
+    def mark(self, phase):
+        # Records the time since the previous mark under this phase name
+        if not self.enabled or self.done:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def finish(self, phase="first frame"):
+        if not self.enabled or self.done:
+            return
+        self.mark(phase)
+        self.done = True
+        total = self.last - self.started
+        if self.mode == "json":
+            record = {name: round(seconds * 1000, 2) for name, seconds in self.phases}
+            record["total"] = round(total * 1000, 2)
+            self.out.write(json.dumps(record) + "\n")
+        else:
+            for name, seconds in self.phases:
+                self.out.write(f"startup: {name:<12} {seconds * 1000:8.1f} ms\n")
+            self.out.write(f"startup: {'total':<12} {total * 1000:8.1f} ms\n")
+        self.out.flush()
@@ -0,0 +1,143 @@
+"""Timer state in a small memory-mapped file, for status bars and panels.
+
+The file holds one fixed-size record guarded by a sequence counter, in the
+style of a seqlock: the writer makes the counter odd, updates the fields
+and makes it even again. A reader copies the record and accepts it only
+if the counter was even and unchanged around the copy, so it never needs
+a lock and, with the mapping kept open, never makes a system call.
+
+Layout, little-endian:
+
+    0   4s   magic b"PTS2"
+    4   Q    sequence, odd while a write is in progress
+    12  B    mode, 0 idle, 1 work, 2 break
+    13  B    state, 0 stopped, 1 running, 2 paused
+    14  H    length of the next reminder's message in bytes
+    16  i    remaining seconds
+    20  i    period length in seconds
+    24  d    progress, 0-100
+    32  d    seconds until the next reminder, -1 without one
+    40  d    time.time() of the update
+    48  d    time.time() at which the period ends, 0 when not running
+    56  128s next reminder's message, UTF-8, cut at a character boundary
+
+Readers should count down from the end time rather than trust the
+remaining seconds, which are only rewritten on ticks, and a hidden window
+ticks only when something happens.
+"""
+import mmap
+import os
+import struct
+import time
+
+from .storage import data_dir
+
+MAGIC = b"PTS2"
+STATUS_NAME = "productivity-timer.status"
+MODES = ("idle", "work", "break")
+# The state byte
+STOPPED, RUNNING, PAUSED = range(3)
+_HEADER = struct.Struct("<4sQ")
+_BODY = struct.Struct("<BBHiidddd128s")
+_SEQUENCE = struct.Struct("<Q")
+RECORD_SIZE = _HEADER.size + _BODY.size
+MESSAGE_SIZE = 128
+
+def default_path():
+    # A tmpfs under $XDG_RUNTIME_DIR when there is one, so updates never touch the disk
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isdir(runtime):
+        return os.path.join(runtime, STATUS_NAME)
+    return os.path.join(data_dir(), STATUS_NAME)
+
+class StatusExport:
+    """Engine listener that mirrors the timer state into the status file."""
+    def __init__(self, engine, path=None):
+        self.engine = engine
+        self.path = path or default_path()
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, RECORD_SIZE)
+            self.map = mmap.mmap(fd, RECORD_SIZE)
+        finally:
+            os.close(fd)
+        self.sequence = 0
+        self.map[:_HEADER.size] = _HEADER.pack(MAGIC, self.sequence)
+        self.write("idle", STOPPED, 0, 0, 0.0)
+
+    def __call__(self, event, info):
+        if event == "tick":
+            self.write("work" if info["is_work_period"] else "break", RUNNING,
+                       info["remaining"], info["total"], info["progress"])
+        elif event == "reminder" and self.engine.running:
+            # The tick before it still showed this reminder as the next one
+            scheduler = self.engine.scheduler
+            total_ns = scheduler.total_ns
+            self.write("work" if self.engine.is_work_period else "break", RUNNING,
+                       scheduler.remaining_seconds(), scheduler.total_seconds,
+                       (total_ns - scheduler.remaining_ns()) / total_ns * 100)
+        elif event == "pause":
+            total = info["total"]
+            self.write("work" if info["is_work_period"] else "break", PAUSED,
+                       info["remaining"], total, (total - info["remaining"]) / total * 100)
+        elif event == "stop":
+            self.write("work" if info["is_work_period"] else "break", STOPPED,
+                       info["remaining"], self.engine.scheduler.total_seconds, 0.0)
+
+    def write(self, mode, state, remaining, total, progress):
+        upcoming = self.engine.next_reminder()
+        if upcoming:
+            next_in, notif = upcoming
+            # Cut at a character boundary, not inside a multi-byte sequence
+            message = str(notif.message).encode("utf-8")[:MESSAGE_SIZE]
+            message = message.decode("utf-8", "ignore").encode("utf-8")
+        else:
+            next_in, message = -1.0, b""
+        now = time.time()
+        ends_at = now + self.engine.scheduler.remaining() if state == RUNNING else 0.0
+        body = _BODY.pack(MODES.index(mode), state, len(message), int(remaining), int(total),
+                          progress, next_in, now, ends_at, message)
+        # Odd while the body is being written, even once it is complete
+        self.sequence += 1
+        self.map[4:12] = _SEQUENCE.pack(self.sequence)
+        self.map[_HEADER.size:] = body
+        self.sequence += 1
+        self.map[4:12] = _SEQUENCE.pack(self.sequence)
+
+    def close(self):
+        # The file is left behind showing an idle timer
+        self.write("idle", STOPPED, 0, 0, 0.0)
+        self.map.close()
+
+class StatusReader:
+    """Keeps the status file mapped, read() then costs no system calls."""
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        with open(self.path, "rb") as handle:
+            self.map = mmap.mmap(handle.fileno(), RECORD_SIZE, access=mmap.ACCESS_READ)
+        if self.map[:4] != MAGIC:
+            self.map.close()
+            raise ValueError(f"{self.path} is not a timer status file")
+
+    def read(self, retries=100):
+        """The current state as a dict, or None if no consistent copy was seen."""
+        for _ in range(retries):
+            before = _SEQUENCE.unpack_from(self.map, 4)[0]
+            if before & 1:
+                continue
+            body = self.map[_HEADER.size:RECORD_SIZE]
+            if _SEQUENCE.unpack_from(self.map, 4)[0] == before:
+                break
+        else:
+            return None
+        mode, state, length, remaining, total, progress, next_in, updated, ends_at, message = \
+            _BODY.unpack(body)
+        return {"mode": MODES[mode], "running": state == RUNNING, "paused": state == PAUSED,
+                "remaining": remaining,
+                "total": total, "progress": progress,
+                "next_reminder_in": None if next_in < 0 else next_in,
+                "next_reminder": message[:length].decode("utf-8", "replace") or None,
+                "updated": updated, "ends_at": ends_at or None}
+
+    def close(self):
+        self.map.close()
@@ -0,0 +1,19 @@
+"""Where the timer keeps its files."""
+import os
+
+def data_dir(create=True):
+    # ~/ProductivityTimer, shared by the GUI and the terminal front end
+    path = os.path.join(os.path.expanduser("~"), "ProductivityTimer")
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+def atomic_write(path, data):
+    # Write to a temporary file next to `path`, then rename it over `path`,
+    # so readers and crashes only ever see the old or the new contents
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,206 @@
+import time
+import tkinter as tk
+
+class ShadowLabel(tk.Frame):
+    """A label with a shadow effect, built once and updated with set_text."""
+    # Measured (width, height) per (text, font), shared by all instances
+    _size_cache = {}
+
+    def __init__(self, parent, text, font, fg, bg, offset=(2,2), shadow_color="black"):
+        super().__init__(parent, bg=bg)
+        self.font = font
+        self.offset = offset
+        self.text = None
+        self.shadow = tk.Label(self, font=font, fg=shadow_color, bg=bg)
+        self.shadow.place(x=offset[0], y=offset[1])
+        self.label = tk.Label(self, font=font, fg=fg, bg=bg)
+        self.label.place(x=0, y=0)
+        self.set_text(text)
+
+    def set_text(self, text, fg=None):
+        if fg is not None:
+            self.label.config(fg=fg)
+        if text == self.text:
+            return
+        self.text = text
+        self.shadow.config(text=text)
+        self.label.config(text=text)
+        key = (text, self.font)
+        size = self._size_cache.get(key)
+        if size is None:
+            # The requested size is known as soon as the text is configured,
+            # so there is no need for an update_idletasks() layout pass
+            size = (self.label.winfo_reqwidth(), self.label.winfo_reqheight())
+            self._size_cache[key] = size
+        self.config(width=size[0] + self.offset[0], height=size[1] + self.offset[1])
+
+class CircularProgressBar(tk.Canvas):
+    def __init__(self, parent, size=300, smooth=False, fps=30, **kwargs):
+        super().__init__(parent, width=size, height=size, highlightthickness=0, **kwargs)
+        self.size = size
+        # Dark background for the progress area
+        self.configure(bg='#1e1e1e')
+        self.angle = 0
+        # The arc and the text are created once and updated in place
+        padding = 10
+        self.arc_item = self.create_arc(padding, padding, size - padding, size - padding,
+                                        start=90, extent=0,
+                                        outline="#3498db", width=8, style="arc",
+                                        state="hidden")
+        self.text_item = self.create_text(size / 2, size / 2, text="",
+                                          font=('Helvetica', 48, 'bold'), fill='white')
+        self._extent = None
+        self._text = None
+        # Smooth mode interpolates the arc between ticks at a capped frame rate,
+        # each step spread over as long as the last tick took to come
+        self.smooth = smooth
+        self.frame_ms = max(1, int(1000 / fps))
+        self.percent = 0
+        self._anim_from = 0
+        self._anim_to = 0
+        self._anim_start = 0.0
+        self._anim_duration = 1.0
+        self._last_draw = None
+        self._anim_id = None
+        # Debug overlay, created on first use
+        self.overlay_item = None
+
+    def set_overlay(self, text):
+        # Small text under the time, None removes it
+        if self.overlay_item is None:
+            if not text:
+                return
+            self.overlay_item = self.create_text(self.size / 2, self.size * 0.72, text=text,
+                                                 font=('Courier', 8), fill='#888888',
+                                                 justify='center', anchor='n')
+        self.itemconfig(self.overlay_item, text=text or "")
+
+    def draw(self, percent=0, time_text="00:00"):
+        if time_text != self._text:
+            self.itemconfig(self.text_item, text=time_text)
+            self._text = time_text
+        now = time.monotonic()
+        last, self._last_draw = self._last_draw, now
+        if self.smooth and 0 < self.percent < percent and last is not None:
+            self._anim_from = self.percent
+            self._anim_to = percent
+            self._anim_start = now
+            # A window back from hidden jumps rather than crawling for minutes
+            self._anim_duration = min(1.0, now - last)
+            if self._anim_id is None:
+                self._animate()
+            return
+        if self._anim_id is not None:
+            self.after_cancel(self._anim_id)
+            self._anim_id = None
+        self._set_percent(percent)
+
+    def _animate(self):
+        # Move the arc towards the latest tick over one tick interval
+        elapsed = time.monotonic() - self._anim_start
+        fraction = min(1.0, elapsed / self._anim_duration) if self._anim_duration > 0 else 1.0
+        self._set_percent(self._anim_from + (self._anim_to - self._anim_from) * fraction)
+        if fraction < 1.0:
+            self._anim_id = self.after(self.frame_ms, self._animate)
+        else:
+            self._anim_id = None
+
+    def _set_percent(self, percent):
+        self.percent = percent
+        # Round to a tenth of a degree so unchanged frames skip the redraw
+        extent = round(-360 * (percent / 100), 1) if percent > 0 else 0
+        if extent == self._extent:
+            return
+        self._extent = extent
+        # Draw the progress arc only if percent > 0
+        if extent:
+            self.itemconfig(self.arc_item, extent=extent, state="normal")
+        else:
+            self.itemconfig(self.arc_item, state="hidden")
+
+class ModernEntry(tk.Frame):
+    def __init__(self, parent, label_text, **kwargs):
+        # Use a slightly larger font (12 instead of 10) for the label.
+        super().__init__(parent, bg='#1e1e1e')
+        # Increased padding by about 10%
+        self.container = tk.Frame(self, bg='#1e1e1e', padx=6, pady=6)
+        self.container.pack(fill=tk.X, expand=True)
+        shadow_label = ShadowLabel(self.container, label_text,
+                                   font=('Helvetica', 12),
+                                   fg='white',
+                                   bg='#1e1e1e',
+                                   offset=(1,1),
+                                   shadow_color="black")
+        shadow_label.pack(anchor='w', pady=(0,6))
+        self.entry = tk.Entry(self.container, **kwargs)
+        self.entry.configure(
+            relief=tk.FLAT,
+            bg='#333333',
+            fg='white',
+            insertbackground='white',
+            font=('Helvetica', 12),
+            bd=0,
+            highlightthickness=1,
+            highlightcolor='#3498db',
+            highlightbackground='#333333'
+        )
+        # Increase the internal vertical padding and external padding by about 10%
+        self.entry.pack(fill=tk.X, pady=(6,7), ipady=4, padx=4)
+        
+    def get(self):
+        return self.entry.get()
+        
+    def delete(self, first, last):
+        return self.entry.delete(first, last)
+        
+    def insert(self, index, string):
+        return self.entry.insert(index, string)
+
+def format_duration(seconds):
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}h {rest // 60:02d}m"
+
+class StatsPanel(tk.Frame):
+    """Session statistics shown next to the progress bar."""
+    ROWS = [("today", "Focus today"), ("week", "Focus this week"),
+            ("completion", "Periods completed"), ("interruptions", "Interruptions / day"),
+            ("lateness", "Reminder delay p50 / p95")]
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, bg='#1e1e1e', padx=12, pady=12, **kwargs)
+        heading = ShadowLabel(self, "Statistics",
+                              font=('Helvetica', 12, 'bold'),
+                              fg='white',
+                              bg='#1e1e1e',
+                              offset=(1,1),
+                              shadow_color='black')
+        heading.pack(anchor='w', pady=(0,6))
+        self.values = {}
+        for key, title in self.ROWS:
+            tk.Label(self, text=title, font=('Helvetica', 9), fg='#aaaaaa',
+                     bg='#1e1e1e').pack(anchor='w')
+            value = tk.Label(self, text="-", font=('Helvetica', 12, 'bold'),
+                             fg='white', bg='#1e1e1e')
+            value.pack(anchor='w', pady=(0,4))
+            self.values[key] = value
+
+    def show(self, report):
+        def late(value):
+            if value is None:
+                return "-"
+            return f"{value:g}s" if value != float("inf") else ">60s"
+        rate = report["completion_rate"]
+        interruptions = report["interruptions_per_day"]
+        self.values["today"].config(text=format_duration(report["today_focus"]),
+                                    font=('Helvetica', 12, 'bold'))
+        self.values["week"].config(text=format_duration(report["week_focus"]))
+        self.values["completion"].config(text=f"{rate:.0%}" if rate is not None else "-")
+        self.values["interruptions"].config(
+            text=f"{interruptions:.1f}" if interruptions is not None else "-")
+        self.values["lateness"].config(
+            text=f"{late(report['late_p50'])} / {late(report['late_p95'])}")
+
+    def show_message(self, message):
+        for value in self.values.values():
+            value.config(text="-")
+        self.values["today"].config(text=message, font=('Helvetica', 9))
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from productivity_timer.analytics import StatsCache, load_columns, summarize
+from productivity_timer.journal import JOURNAL_NAME, read_journal
+
+DAY = 86400
+# Midnight UTC of some Wednesday
+MONDAY = 19723 * DAY
+WEDNESDAY = MONDAY + 2 * DAY
+
+# Two days: a full work period, a break, a work period stopped with 600s
+# left; the next day one more full period with a reminder 0.3s late
+JOURNAL = [
+    {"t": WEDNESDAY + 3600, "e": "start", "mode": "work", "len": 3600},
+    {"t": WEDNESDAY + 7200, "e": "remind", "when": "50%", "late": 0.1, "msg": "a"},
+    {"t": WEDNESDAY + 7200, "e": "complete", "mode": "work"},
+    {"t": WEDNESDAY + 7200, "e": "start", "mode": "break", "len": 900},
+    {"t": WEDNESDAY + 8100, "e": "complete", "mode": "break"},
+    {"t": WEDNESDAY + 8100, "e": "start", "mode": "work", "len": 3600},
+    {"t": WEDNESDAY + 11100, "e": "stop", "mode": "work", "left": 600},
+    {"t": WEDNESDAY + DAY + 3600, "e": "start", "mode": "work", "len": 1500},
+    {"t": WEDNESDAY + DAY + 5100, "e": "remind", "when": "+10m", "late": 0.3, "msg": "b"},
+    {"t": WEDNESDAY + DAY + 5100, "e": "complete", "mode": "work"},
+]
+
+def append(directory, entries):
+    with open(directory / JOURNAL_NAME, "a", encoding="utf-8") as handle:
+        for entry in entries:
+            handle.write(json.dumps(entry) + "\n")
+
+def report(directory, now):
+    return StatsCache(directory, utc_offset=0).update().report(now=now)
+
+def test_report_over_a_fixed_journal(tmp_path):
+    append(tmp_path, JOURNAL)
+    stats = report(tmp_path, WEDNESDAY + DAY + 6000)
+    assert stats["today_focus"] == 1500
+    assert stats["week_focus"] == 3600 + 3000 + 1500
+    assert stats["completion_rate"] == 2 / 3
+    assert stats["interruptions_per_day"] == 0.5
+    assert stats["reminders"] == 2
+    assert stats["late_p50"] == 0.25
+    assert stats["late_max"] == 0.3
+    # A week later nothing counts for this week any more
+    assert report(tmp_path, WEDNESDAY + 7 * DAY)["week_focus"] == 0
+
+def test_summarize_per_day():
+    columns = load_columns(JOURNAL)
+    days, totals, late_counts, late, carry_len = summarize(columns)
+    assert days.tolist() == [WEDNESDAY // DAY, WEDNESDAY // DAY + 1]
+    assert totals[:, 0].tolist() == [6600, 1500]
+    assert totals[:, 1].tolist() == [2, 1]
+    assert carry_len == 0.0
+
+@pytest.mark.parametrize("split", range(1, len(JOURNAL)))
+def test_incremental_updates_match_one_pass(tmp_path, split):
+    # carry_len takes a period started in one batch into the next
+    append(tmp_path, JOURNAL[:split])
+    StatsCache(tmp_path, utc_offset=0).update()
+    append(tmp_path, JOURNAL[split:])
+    stats = report(tmp_path, WEDNESDAY + DAY)
+    one_pass_dir = tmp_path / "one"
+    one_pass_dir.mkdir()
+    append(one_pass_dir, JOURNAL)
+    assert stats == report(one_pass_dir, WEDNESDAY + DAY)
+
+def test_events_in_the_same_millisecond_as_the_last_update(tmp_path):
+    start = WEDNESDAY + 3600
+    append(tmp_path, [{"t": start, "e": "start", "mode": "work", "len": 60}])
+    StatsCache(tmp_path, utc_offset=0).update()
+    append(tmp_path, [{"t": start, "e": "stop", "mode": "work", "left": 0}])
+    stats = report(tmp_path, start)
+    assert stats["today_focus"] == 60
+    assert stats["interruptions_per_day"] == 1
+
+def test_update_without_new_lines_keeps_the_cache(tmp_path):
+    append(tmp_path, JOURNAL)
+    first = report(tmp_path, WEDNESDAY + DAY)
+    assert report(tmp_path, WEDNESDAY + DAY) == first
+    assert len(list(read_journal(tmp_path))) == len(JOURNAL)
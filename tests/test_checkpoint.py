@@ -0,0 +1,87 @@
+import pytest
+
+from productivity_timer.checkpoint import SessionCheckpoint, restore_session
+from productivity_timer.engine import MAX_SKIP, TimerEngine
+from productivity_timer.reminders import parse_reminder_spec
+from productivity_timer.simulation import VirtualClock
+
+def new_engine(work=3600, brk=900):
+    clock = VirtualClock()
+    engine = TimerEngine(work, brk, clock=clock, wall_clock=clock.wall)
+    events = []
+    engine.add_listener(lambda event, info: event != "tick" and events.append((event, info)))
+    return engine, clock, events
+
+def saved_session(active, reminders=()):
+    # A checkpoint of a 60/15 session after `active` seconds
+    engine, clock, _ = new_engine()
+    engine.set_reminders([parse_reminder_spec(spec) for spec in reminders])
+    engine.start()
+    while clock() < active:
+        clock.advance(min(engine.next_event_delay(), active - clock()))
+        engine.tick()
+    return SessionCheckpoint(engine, "", wall_clock=clock.wall).snapshot()
+
+def test_restore_continues_where_it_stopped():
+    data = saved_session(600)
+    engine, clock, _ = new_engine()
+    restore_session(engine, data, now=data["saved"] + 2)
+    assert engine.is_work_period
+    assert engine.scheduler.remaining_seconds() == 2998
+
+def test_missed_time_carries_into_the_next_periods():
+    # Work with 300s left, relaunched 1800s later: the 900s break went by
+    # and the next work period is 600s in
+    data = saved_session(3300)
+    engine, clock, events = new_engine()
+    restore_session(engine, data, now=data["saved"] + 1800)
+    assert engine.running and engine.is_work_period
+    assert engine.scheduler.remaining_seconds() == 3000
+    # Periods that went by are flagged, so nothing alerts or counts them
+    assert [(event, info["is_work_period"], info["skipped"]) for event, info in events
+            if event.startswith("period")] == [("period_complete", True, True),
+                                               ("period_start", False, True),
+                                               ("period_complete", False, True),
+                                               ("period_start", True, True)]
+    skip = next(info for event, info in events if event == "skip")
+    assert (skip["periods"], skip["interrupted"], skip["left"]) == (2, True, 300)
+    assert events[-1][0] == "restore" and events[-1][1]["remaining"] == 3000
+
+def test_reminders_missed_while_away_are_skipped():
+    data = saved_session(3300, ["50:Half", "+10m:Ten", "every 25m:Repeat"])
+    engine, clock, events = new_engine()
+    restore_session(engine, data, now=data["saved"] + 1800)
+    assert not [event for event, _ in events if event == "reminder"]
+    fired = []
+    engine.add_listener(lambda event, info: event == "reminder"
+                        and fired.append((round(engine.session_elapsed()), info["message"])))
+    while engine.session_elapsed() < 6300:
+        clock.advance(engine.next_event_delay())
+        engine.tick()
+    # Ten would have fired 10 minutes into this work period, already past
+    assert fired == [(6000, "Repeat"), (6300, "Half")]
+
+def test_long_gaps_count_up_to_max_skip():
+    data = saved_session(600)
+    engine, clock, _ = new_engine()
+    restore_session(engine, data, now=data["saved"] + MAX_SKIP + 86400)
+    # 12 hours are 9.6 cycles of 4500s: 600 + 43200 = 9 * 4500 + 3300
+    assert engine.is_work_period
+    assert engine.scheduler.remaining_seconds() == 300
+
+@pytest.mark.parametrize("change", [
+    {"reminders": [5]},
+    {"reminders": [{"every": "often", "message": "x"}]},
+    {"reminders": [[50, "Half"]], "fired": [-1]},
+    {"reminders": [[50, "Half"]], "fired": [1]},
+    {"reminders": [[50, "Half"]], "fired": [True]},
+    {"total": "long"},
+    {"total": 0, "remaining": 0},
+    {"elapsed": None},
+])
+def test_broken_checkpoints_raise_value_error(change):
+    data = dict(saved_session(600), **change)
+    engine, clock, _ = new_engine()
+    with pytest.raises(ValueError):
+        restore_session(engine, data, now=data["saved"] + 2)
+    assert not engine.running
@@ -0,0 +1,42 @@
+import http.client
+
+import pytest
+
+from productivity_timer.control import ControlServer
+
+@pytest.fixture
+def server():
+    calls = []
+    server = ControlServer({"reset": lambda: calls.append("reset")}, lambda callback: callback(),
+                           http_port=0).start()
+    server.calls = calls
+    server.port = int(next(iter(server.http_hosts)).rpartition(":")[2])
+    yield server
+    server.close()
+
+def post(server, path, host=None, headers=()):
+    # A POST with a text/plain JSON body, like a no-CORS fetch() sends
+    connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+    connection.putrequest("POST", path, skip_host=host is not None)
+    if host is not None:
+        connection.putheader("Host", host)
+    for name, value in headers:
+        connection.putheader(name, value)
+    connection.putheader("Content-Type", "text/plain")
+    connection.putheader("Content-Length", "2")
+    connection.endheaders(b"{}")
+    status = connection.getresponse().status
+    connection.close()
+    return status
+
+def test_local_requests_are_served(server):
+    assert post(server, "/reset") == 200
+    assert post(server, "/reset", host=f"localhost:{server.port}") == 200
+    assert server.calls == ["reset", "reset"]
+
+def test_requests_from_web_pages_are_refused(server):
+    assert post(server, "/reset", headers=[("Origin", "https://example.com")]) == 403
+    assert post(server, "/reset", headers=[("Origin", "null")]) == 403
+    assert post(server, "/reset", host=f"attacker.example:{server.port}") == 403
+    assert post(server, "/reset", host="127.0.0.1") == 403
+    assert server.calls == []
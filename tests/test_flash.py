@@ -0,0 +1,54 @@
+import threading
+import time
+
+from productivity_timer.flash import XrandrFlasher
+
+def slow_flasher(delay=0.05):
+    # An XrandrFlasher whose xrandr calls sleep instead of running xrandr
+    flasher = XrandrFlasher(duration=delay)
+    calls = []
+    done = threading.Event()
+    def find_primary_display():
+        time.sleep(delay)
+        return "eDP-1"
+    def set_brightness(value):
+        time.sleep(delay)
+        calls.append(value)
+        if value == "1":
+            done.set()
+        return True
+    flasher._find_primary_display = find_primary_display
+    flasher._set_brightness = set_brightness
+    return flasher, calls, done
+
+def wait_idle(flasher):
+    deadline = time.monotonic() + 5
+    while flasher._busy.is_set() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not flasher._busy.is_set()
+
+def test_flash_returns_at_once():
+    flasher, calls, done = slow_flasher()
+    durations = []
+    for _ in range(20):
+        start = time.perf_counter()
+        flasher.flash((1920, 1080))
+        durations.append(time.perf_counter() - start)
+    assert max(durations) < 0.001
+    assert done.wait(5)
+
+def test_flash_during_a_flash_is_dropped():
+    flasher, calls, done = slow_flasher()
+    flasher.flash()
+    time.sleep(0.02)
+    flasher.flash()
+    flasher.flash()
+    assert done.wait(5)
+    wait_idle(flasher)
+    time.sleep(0.2)
+    assert calls == ["0.1", "1"]
+    # Once it is over the next flash goes through again
+    done.clear()
+    flasher.flash()
+    assert done.wait(5)
+    assert calls == ["0.1", "1", "0.1", "1"]
@@ -0,0 +1,97 @@
+import json
+import os
+
+from productivity_timer.journal import (JOURNAL_NAME, SessionJournal, read_journal,
+                                        read_journal_after)
+
+def write_entries(directory, count, start=0, max_bytes=1_000_000):
+    journal = SessionJournal(directory, max_bytes=max_bytes, clock=lambda: 1000.0)
+    for number in range(start, start + count):
+        journal.record("remind", n=number)
+    journal.close()
+
+def numbers(entries):
+    return [entry["n"] for entry in entries]
+
+def test_entries_come_back_in_order_across_rotation(tmp_path):
+    write_entries(tmp_path, 100, max_bytes=500)
+    rotated = sorted(name for name in os.listdir(tmp_path) if name.startswith("journal-"))
+    assert rotated[0] == "journal-000001.jsonl" and len(rotated) > 5
+    assert all(os.path.getsize(tmp_path / name) < 600 for name in rotated)
+    assert numbers(read_journal(tmp_path)) == list(range(100))
+    # A second journal carries on numbering the rotated files
+    write_entries(tmp_path, 100, start=100, max_bytes=500)
+    assert numbers(read_journal(tmp_path)) == list(range(200))
+
+def test_since_skips_old_files_and_entries(tmp_path):
+    (tmp_path / "journal-000001.jsonl").write_text('{"t":100,"e":"x","n":0}\n')
+    (tmp_path / JOURNAL_NAME).write_text('{"t":150,"e":"x","n":1}\n{"t":250,"e":"x","n":2}\n')
+    os.utime(tmp_path / "journal-000001.jsonl", (100, 100))
+    os.utime(tmp_path / JOURNAL_NAME, (250, 250))
+    assert numbers(read_journal(tmp_path, since=200)) == [2]
+    assert numbers(read_journal(tmp_path, since=150)) == [1, 2]
+    assert numbers(read_journal(tmp_path)) == [0, 1, 2]
+
+def test_torn_last_line_is_ignored(tmp_path):
+    (tmp_path / JOURNAL_NAME).write_text('{"t":1,"e":"x","n":0}\n{"t":2,"e":"x","n":1}\n{"t":3,"e"')
+    assert numbers(read_journal(tmp_path)) == [0, 1]
+    entries, cursor = read_journal_after(tmp_path)
+    assert numbers(entries) == [0, 1]
+    # The writer finishes the line later, it is read then and only then
+    with open(tmp_path / JOURNAL_NAME, "a") as handle:
+        handle.write(':"x","n":2}\n')
+    entries, cursor = read_journal_after(tmp_path, cursor)
+    assert numbers(entries) == [2]
+    assert read_journal_after(tmp_path, cursor) == ([], cursor)
+
+def test_cursor_follows_rotation(tmp_path):
+    write_entries(tmp_path, 10, max_bytes=10_000)
+    entries, cursor = read_journal_after(tmp_path)
+    assert numbers(entries) == list(range(10))
+    # The file read so far is rotated away while more is written
+    write_entries(tmp_path, 100, start=10, max_bytes=500)
+    entries, cursor = read_journal_after(tmp_path, cursor)
+    assert numbers(entries) == list(range(10, 110))
+    write_entries(tmp_path, 5, start=110, max_bytes=500)
+    entries, _ = read_journal_after(tmp_path, cursor)
+    assert numbers(entries) == list(range(110, 115))
+
+def test_engine_events_are_journaled(tmp_path):
+    from productivity_timer.engine import TimerEngine
+    from productivity_timer.simulation import VirtualClock
+    clock = VirtualClock()
+    journal = SessionJournal(tmp_path, clock=clock.wall)
+    engine = TimerEngine(60, 30, clock=clock, wall_clock=clock.wall)
+    engine.add_listener(journal)
+    engine.start()
+    clock.advance(60)
+    engine.tick()
+    clock.advance(10)
+    engine.pause()
+    engine.stop()
+    journal.close()
+    lines = (tmp_path / JOURNAL_NAME).read_text().splitlines()
+    events = [(entry["e"], entry.get("mode")) for entry in map(json.loads, lines)]
+    assert events == [("start", "work"), ("complete", "work"), ("start", "break"),
+                      ("pause", "break"), ("stop", "break")]
+
+def test_periods_skipped_while_suspended_are_not_focus(tmp_path):
+    from productivity_timer.engine import TimerEngine
+    from productivity_timer.simulation import VirtualClock
+    clock = VirtualClock()
+    journal = SessionJournal(tmp_path, clock=clock.wall)
+    engine = TimerEngine(3600, 900, clock=clock, wall_clock=clock.wall)
+    engine.add_listener(journal)
+    engine.start()
+    clock.advance(3300)
+    engine.tick()
+    # Suspended for 1800s: the work period ends 300s in, the break goes by
+    # and the next work period has 3000s left
+    engine.skip(1800)
+    engine.stop()
+    journal.close()
+    lines = (tmp_path / JOURNAL_NAME).read_text().splitlines()
+    events = [(entry["e"], entry.get("mode"), entry.get("len", entry.get("left")))
+              for entry in map(json.loads, lines)]
+    assert events == [("start", "work", 3600), ("stop", "work", 300), ("start", "work", 3000),
+                      ("stop", "work", 3000)]
@@ -0,0 +1,73 @@
+import pytest
+
+from productivity_timer.manager import TimerManager
+from productivity_timer.reminders import parse_reminder_spec
+from productivity_timer.simulation import VirtualClock
+
+def manager_with(*timers, slack=0.005):
+    clock = VirtualClock()
+    manager = TimerManager(clock=clock, slack=slack, wall_clock=clock.wall)
+    events = []
+    for name, work, brk in timers:
+        engine = manager.add(name, work, brk)
+        engine.add_listener(lambda event, info, name=name: event in ("period_complete", "reminder")
+                            and events.append((round(clock(), 3), name, event)))
+    return manager, clock, events
+
+def test_engines_share_the_manager_clocks():
+    manager, clock, _ = manager_with(("a", 60, 30))
+    engine = manager.get("a")
+    assert engine.clock is clock and engine.wall_clock == clock.wall
+    # A simulated hour is not taken for a suspend
+    manager.start("a")
+    manager.run(sleep=clock.advance, until=3600)
+    assert engine.running and clock() <= 3600
+
+def test_timers_complete_on_their_own_schedules():
+    manager, clock, events = manager_with(("short", 60, 30), ("long", 120, 60))
+    manager.start("short")
+    manager.start("long")
+    manager.run(sleep=clock.advance, until=170)
+    completes = [(at, name) for at, name, event in events if event == "period_complete"]
+    # Ticked late by at most the slack, never early
+    assert [name for _, name in completes] == ["short", "short", "long", "short"]
+    assert [round(at) for at, _ in completes] == [60, 90, 120, 150]
+    assert all(0 <= at - round(at) <= 0.005 + 1e-9 for at, _ in completes)
+
+def test_paused_and_stopped_timers_are_not_ticked():
+    manager, clock, events = manager_with(("a", 60, 30), ("b", 60, 30))
+    manager.start("a")
+    manager.start("b")
+    manager.pause("a")
+    manager.run(sleep=clock.advance, until=61)
+    assert [name for _, name, _ in events] == ["b"]
+    manager.stop("b")
+    manager.resume("a")
+    assert manager.running() == ["a"]
+    manager.run(sleep=clock.advance, until=200)
+    assert [name for _, name, _ in events] == ["b", "a", "a"]
+
+def test_close_deadlines_share_a_wakeup():
+    manager, clock, _ = manager_with(*[(f"t{number}", 60, 30) for number in range(10)],
+                                     slack=0.01)
+    for name in manager.names():
+        manager.start(name)
+        clock.advance(0.001)
+    manager.wakeups = 0
+    delay = manager.next_delay()
+    clock.advance(delay)
+    assert manager.run_due() == 10
+    assert manager.wakeups == 1
+
+def test_reminders_and_names():
+    manager, clock, events = manager_with()
+    manager.add("a", 60, 30, reminders=[parse_reminder_spec("+10s:Ten")])
+    manager.get("a").add_listener(lambda event, info: event == "reminder"
+                                  and events.append((round(clock(), 3), "a", event)))
+    with pytest.raises(ValueError):
+        manager.add("a", 60, 30)
+    manager.start("a")
+    manager.run(sleep=clock.advance, until=11)
+    assert [(round(at), event) for at, _, event in events] == [(10, "reminder")]
+    manager.remove("a")
+    assert manager.names() == [] and manager.next_delay() is None
@@ -0,0 +1,137 @@
+import sys
+import threading
+import time
+import types
+
+from productivity_timer.backends import Notify2Backend
+from productivity_timer.notifier import NotificationDispatcher
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+def done(dispatcher, count):
+    stats = dispatcher.stats()
+    return stats["delivered"] + stats["failed"] == count
+
+class BlockingSend:
+    # Holds up the first delivery until released, so later messages queue up
+    def __init__(self):
+        self.sent = []
+        self.release = threading.Event()
+
+    def __call__(self, message):
+        if not self.sent:
+            self.release.wait(5)
+        self.sent.append(message)
+
+def test_burst_is_coalesced():
+    send = BlockingSend()
+    dispatcher = NotificationDispatcher(send, None, workers=1, clock=lambda: 100.0)
+    dispatcher.submit("first")
+    wait_for(lambda: not dispatcher.stats()["queue_depth"])
+    for message in ("a", "b", "c"):
+        dispatcher.submit(message)
+    send.release.set()
+    wait_for(lambda: done(dispatcher, 2))
+    assert send.sent == ["first", "a\nb\nc"]
+    assert dispatcher.stats()["coalesced"] == 2
+
+def test_messages_apart_are_not_coalesced():
+    send = BlockingSend()
+    times = iter([0.0, 5.0, 10.0, 20.0, 20.0, 20.0])
+    dispatcher = NotificationDispatcher(send, None, workers=1, clock=lambda: next(times))
+    dispatcher.submit("first")
+    wait_for(lambda: not dispatcher.stats()["queue_depth"])
+    dispatcher.submit("a")
+    dispatcher.submit("b")
+    send.release.set()
+    wait_for(lambda: done(dispatcher, 3))
+    assert send.sent == ["first", "a", "b"]
+    assert dispatcher.stats()["coalesced"] == 0
+
+def test_failed_sends_are_retried_with_backoff():
+    sleeps = []
+    attempts = []
+    def send(message):
+        attempts.append(message)
+        if len(attempts) < 3:
+            raise OSError("no notification daemon")
+    fallback = []
+    dispatcher = NotificationDispatcher(send, fallback.append, retries=2, backoff=0.5,
+                                        sleep=sleeps.append)
+    dispatcher.submit("hello")
+    wait_for(lambda: done(dispatcher, 1))
+    assert attempts == ["hello"] * 3
+    assert sleeps == [0.5, 1.0]
+    assert fallback == []
+    assert dispatcher.stats()["delivered"] == 1
+
+def test_fallback_after_the_last_retry():
+    def send(message):
+        raise OSError("no notification daemon")
+    fallback = []
+    dispatcher = NotificationDispatcher(send, fallback.append, retries=1,
+                                        sleep=lambda seconds: None)
+    dispatcher.submit("hello")
+    wait_for(lambda: done(dispatcher, 1))
+    assert fallback == ["hello"]
+    assert dispatcher.stats()["failed"] == 1
+
+def test_without_a_backend_the_fallback_runs_at_once():
+    fallback = []
+    NotificationDispatcher(None, fallback.append).submit("hello")
+    assert fallback == ["hello"]
+
+def test_full_queue_drops_and_stats_count_it():
+    send = BlockingSend()
+    now = [0.0]
+    latencies = []
+    dispatcher = NotificationDispatcher(send, None, workers=1, maxsize=2, coalesce_window=0,
+                                        clock=lambda: now[0], observe=latencies.append)
+    dispatcher.submit("first")
+    wait_for(lambda: not dispatcher.stats()["queue_depth"])
+    for message in ("a", "b", "c", "d"):
+        dispatcher.submit(message)
+    assert dispatcher.stats()["queue_depth"] == 2
+    now[0] = 3.0
+    send.release.set()
+    wait_for(lambda: done(dispatcher, 3))
+    stats = dispatcher.stats()
+    assert send.sent == ["first", "a", "b"]
+    assert stats["dropped"] == 2
+    assert stats["delivered"] == 3
+    assert stats["latency_max"] == 3.0
+    assert stats["latency_avg"] == 3.0
+    assert latencies == [3.0, 3.0, 3.0]
+
+def test_notify2_connects_once_and_sends_one_at_a_time(monkeypatch):
+    state = {"inits": 0, "showing": 0, "overlap": False, "shown": 0}
+    lock = threading.Lock()
+    class Notification:
+        def __init__(self, title, message, icon):
+            self.message = message
+        def show(self):
+            with lock:
+                state["showing"] += 1
+                state["overlap"] |= state["showing"] > 1
+            time.sleep(0.01)
+            with lock:
+                state["showing"] -= 1
+                state["shown"] += 1
+    def init(name):
+        time.sleep(0.02)
+        state["inits"] += 1
+    module = types.SimpleNamespace(init=init, Notification=Notification)
+    monkeypatch.setitem(sys.modules, "notify2", module)
+    backend = Notify2Backend()
+    threads = [threading.Thread(target=backend.send, args=(f"m{index}",)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert state["inits"] == 1
+    assert state["shown"] == 4
+    assert not state["overlap"]
@@ -0,0 +1,94 @@
+import pytest
+
+from productivity_timer.engine import TimerEngine
+from productivity_timer.reminders import parse_reminder_spec
+from productivity_timer.simulation import VirtualClock
+
+def paused_engine(active, paused_for):
+    # A 60/15 session paused after `active` seconds and left paused for `paused_for`
+    clock = VirtualClock()
+    engine = TimerEngine(3600, 900, clock=clock, wall_clock=clock.wall)
+    fired = []
+    engine.add_listener(lambda event, info: event == "reminder"
+                        and fired.append((engine.session_elapsed(), info["message"])))
+    engine.start()
+    run(engine, clock, active)
+    engine.pause()
+    clock.advance(paused_for)
+    return engine, clock, fired
+
+def run(engine, clock, seconds):
+    # Jumps from event to event for `seconds` of clock time
+    end = clock() + seconds
+    while engine.running:
+        delay = engine.next_event_delay()
+        if clock() + delay > end:
+            break
+        clock.advance(delay)
+        engine.tick()
+    clock.advance(max(0, end - clock()))
+    if engine.running:
+        engine.tick()
+
+def test_pause_keeps_remaining_time():
+    engine, clock, _ = paused_engine(600, 1800)
+    assert engine.scheduler.remaining_seconds() == 3000
+    engine.resume()
+    run(engine, clock, 2999)
+    assert engine.is_work_period
+    run(engine, clock, 1)
+    assert not engine.is_work_period
+
+def test_reminders_added_while_paused_fire_after_resume():
+    engine, clock, fired = paused_engine(600, 1200)
+    engine.add_reminder(parse_reminder_spec("+15m:Offset"))
+    engine.add_reminder(parse_reminder_spec("every 10m:Repeat"))
+    engine.add_reminder(parse_reminder_spec("50:Half"))
+    # Already behind the paused countdown, so never due this period
+    engine.add_reminder(parse_reminder_spec("+5m:Passed"))
+    assert fired == []
+    engine.resume()
+    run(engine, clock, 3 * 4500)
+    session = [(round(at), message) for at, message in fired]
+    assert session[:4] == [(900, "Offset"), (1200, "Repeat"), (1800, "Half"),
+                           (1800, "Repeat")]
+    # Period reminders come back every work period, repeats every ten minutes
+    assert [at for at, message in session if message == "Offset"] == [900, 5400, 9900]
+    assert [at for at, message in session if message == "Passed"] == [4800, 9300, 13800]
+    assert [at for at, message in session if message == "Repeat"] == list(range(1200, 14100, 600))
+
+def test_reminders_set_while_paused_replace_the_queue():
+    engine, clock, fired = paused_engine(600, 1200)
+    engine.set_reminders([parse_reminder_spec("+20m:Replaced")])
+    engine.resume()
+    run(engine, clock, 3600)
+    assert [(round(at), message) for at, message in fired] == [(1200, "Replaced")]
+
+def test_fractional_repeats_fire_once_each_around_a_pause():
+    # Repeats that land between whole nanoseconds must not be pushed back onto
+    # the deadline that just fired
+    engine, clock, fired = paused_engine(0, 0)
+    engine.add_reminder(parse_reminder_spec("every 1.1s:Repeat"))
+    engine.resume()
+    run(engine, clock, 10.05)
+    engine.pause()
+    clock.advance(0.37)
+    engine.resume()
+    run(engine, clock, 290)
+    assert len(fired) == 272
+    assert all(abs(at - 1.1 * number) < 1e-6 for number, (at, _) in enumerate(fired, 1))
+
+def test_repeats_faster_than_a_second_are_rejected():
+    with pytest.raises(ValueError):
+        parse_reminder_spec("every 0.5s:Too often")
+    assert parse_reminder_spec("every 1s:Often").every == 1
+
+def test_start_after_stopping_in_a_break_begins_with_work():
+    engine, clock, _ = paused_engine(0, 0)
+    engine.resume()
+    run(engine, clock, 3700)
+    assert not engine.is_work_period
+    engine.stop()
+    engine.start()
+    assert engine.is_work_period
+    assert engine.scheduler.remaining_seconds() == 3600
@@ -0,0 +1,30 @@
+from productivity_timer.engine import TimerEngine
+from productivity_timer.power import WakeupMeter, tick_delay
+from productivity_timer.reminders import parse_reminder_spec
+from productivity_timer.simulation import VirtualClock
+
+def hour(visible):
+    # Wakeups and fired reminders over a 60 minute work period
+    clock = VirtualClock()
+    engine = TimerEngine(3600, 900, clock=clock, wall_clock=clock.wall)
+    engine.set_reminders(parse_reminder_spec(spec) for spec in
+                         ("25:Quarter", "50:Half way", "+50m:Wrap up", "every 20m:Drink water"))
+    fired = []
+    engine.add_listener(lambda event, info: event == "reminder"
+                        and fired.append((round(clock(), 3), info["message"])))
+    meter = WakeupMeter(window=3600, clock=clock)
+    engine.start()
+    while clock() < 3600:
+        clock.advance(tick_delay(engine, visible))
+        meter.record()
+        engine.tick()
+    return meter.total, fired
+
+def test_hidden_window_wakes_up_only_for_events():
+    visible_wakeups, visible_fired = hour(True)
+    hidden_wakeups, hidden_fired = hour(False)
+    assert visible_wakeups == 3600
+    # Quarter, half way, wrap up and three repeats, the last as the period ends
+    assert hidden_wakeups == 6
+    assert hidden_fired == visible_fired
+    assert [at for at, _ in hidden_fired] == [900, 1200, 1800, 2400, 3000, 3600]
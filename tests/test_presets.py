@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from productivity_timer.presets import Preset, PresetStore
+from productivity_timer.reminders import parse_reminder_spec
+
+def test_deleted_preset_stays_deleted(tmp_path):
+    store = PresetStore(tmp_path).load()
+    store.put("Focus", Preset("50", "10"))
+    store.save()
+    store = PresetStore(tmp_path).load()
+    store.delete("Focus")
+    assert store.current is None
+    # What closing the window does
+    store.last = Preset("45", "5")
+    store.save()
+    store = PresetStore(tmp_path).load()
+    assert store.names() == []
+    assert store.startup_preset().work == "45"
+
+def test_closing_keeps_named_presets(tmp_path):
+    store = PresetStore(tmp_path).load()
+    store.put("Focus", Preset("50", "10"))
+    store.last = Preset("5", "1")
+    store.save()
+    store = PresetStore(tmp_path).load()
+    assert store.get("Focus").work == "50"
+    assert store.current == "Focus"
+    assert store.startup_preset().work == "5"
+
+@pytest.mark.parametrize("text", ["[1, 2]", '"presets"', '{"version": "1"}',
+                                  '{"version": 1, "presets": {"x": {"reminders": [5]}}}',
+                                  '{"version": 1, "presets": []}', "{not json",
+                                  # No version, the shape of a file nothing ever wrote
+                                  '{"work": "50", "break": "10"}',
+                                  '{"version": 1, "presets": {"x": {"reminders": [[150, "Late"]]}}}',
+                                  '{"version": 1, "presets": {"x": {"reminders": '
+                                  '[{"every": 0.1, "message": "Fast"}]}}}',
+                                  '{"version": 1, "last": {"reminders": [[50, ""]]}}'])
+def test_unreadable_file_is_moved_aside(tmp_path, text):
+    (tmp_path / "presets.json").write_text(text)
+    store = PresetStore(tmp_path).load()
+    assert store.names() == []
+    assert os.path.exists(tmp_path / "presets.json.bad")
+    store.put("Focus", Preset())
+    store.save()
+    assert PresetStore(tmp_path).load().names() == ["Focus"]
+
+def test_reminders_round_trip(tmp_path):
+    store = PresetStore(tmp_path).load()
+    store.put("Focus", Preset("50", "10", [parse_reminder_spec(spec) for spec in
+                                          ("50:Half", "every 20m:Water", "@14:30 during break:Walk")]))
+    store.save()
+    reminders = PresetStore(tmp_path).load().get("Focus").reminders
+    assert [notif.describe() for notif in reminders] == ["50.0%", "every 20m",
+                                                         "@14:30 during break"]
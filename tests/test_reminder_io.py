@@ -0,0 +1,93 @@
+import io
+
+import pytest
+
+from productivity_timer import reminder_io
+from productivity_timer.reminder_io import read_reminders, write_reminders
+from productivity_timer.reminders import parse_reminder_spec
+
+ARRAY = '[[50, "Half"], {"every": 1200, "message": "Water"}, [12.5, "Eighth"]]'
+LINES = '[50, "Half"]\n{"every": 1200, "message": "Water"}\n[12.5, "Eighth"]\n'
+WRAPPED = '{"version": 1, "reminders": ' + ARRAY + '}'
+EXPECTED = ["50.0% Half", "every 20m Water", "12.5% Eighth"]
+
+def described(result):
+    return [f"{notif.describe()} {notif.message}" for notif in result.entries]
+
+def read(text, name=None, chunk_size=None, monkeypatch=None):
+    if chunk_size:
+        monkeypatch.setattr(reminder_io, "CHUNK_SIZE", chunk_size)
+    return read_reminders(io.StringIO(text), name)
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 2, 3, 4, 5, 6, 7])
+@pytest.mark.parametrize("text", [ARRAY, LINES, WRAPPED, " \n" + ARRAY.replace(", ", ",\n ")])
+def test_json_in_any_chunk_size(monkeypatch, chunk_size, text):
+    result = read(text, chunk_size=chunk_size, monkeypatch=monkeypatch)
+    assert described(result) == EXPECTED
+    assert result.errors == []
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 3, 7])
+def test_numbers_split_across_chunks(monkeypatch, chunk_size):
+    # A lone pair is one reminder, and 12.5 must not be cut into 12 and .5
+    result = read('[12.5, "Eighth"]', chunk_size=chunk_size, monkeypatch=monkeypatch)
+    assert described(result) == ["12.5% Eighth"]
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 4])
+def test_broken_json_keeps_what_came_before(monkeypatch, chunk_size):
+    result = read('[[50, "Half"], [25, "Quarter"], [75, "Thr', chunk_size=chunk_size,
+                  monkeypatch=monkeypatch)
+    assert described(result) == ["50.0% Half", "25.0% Quarter"]
+    assert len(result.errors) == 1 and result.errors[0][0] is None
+    assert result.errors[0][1].startswith("invalid JSON")
+
+def test_bad_json_items_are_reported_by_number():
+    result = read('[[50, "Half"], 5, [1, 2, 3], [150, "Late"], {"every": 0.1, "message": "x"}]')
+    assert described(result) == ["50.0% Half"]
+    assert [number for number, _ in result.errors] == [2, 3, 4, 5]
+
+def test_empty_json_array():
+    result = read("[]")
+    assert result.entries == [] and result.errors == []
+
+def test_csv_with_header_and_bad_rows():
+    text = ("when,message\n"
+            "50,Half way\n"
+            "\n"
+            "+10m,Stand up, stretch\n"
+            "nonsense\n"
+            "150,Too late\n"
+            '"@14:30","Call"\n'
+            "every 20m during any,Water\n"
+            "50,Half way\n")
+    result = read(text, name="pack.csv")
+    assert described(result) == ["50.0% Half way", "+10m Stand up, stretch", "@14:30 Call",
+                                 "every 20m Water"]
+    assert [number for number, _ in result.errors] == [5, 6]
+    assert result.duplicates == 1
+
+def test_csv_without_header():
+    result = read("25,Quarter\n75,Three quarters")
+    assert described(result) == ["25.0% Quarter", "75.0% Three quarters"]
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 5])
+def test_csv_in_any_chunk_size(monkeypatch, chunk_size):
+    result = read("percent,message\n50,Half\n+10m,Ten\n", chunk_size=chunk_size,
+                  monkeypatch=monkeypatch)
+    assert described(result) == ["50.0% Half", "+10m Ten"]
+
+def test_existing_reminders_count_as_duplicates():
+    existing = [parse_reminder_spec("50:Half")]
+    result = read_reminders(io.StringIO(LINES), existing=existing)
+    assert described(result) == EXPECTED[1:]
+    assert result.duplicates == 1
+
+@pytest.mark.parametrize("fmt", ["csv", "json"])
+def test_export_reads_back(fmt):
+    notifications = [parse_reminder_spec(spec) for spec in
+                     ("50:Half", "+10m:Stand up, stretch", "@14:30 during break:Walk",
+                      "every 20m:Water")]
+    out = io.StringIO()
+    write_reminders(notifications, out, fmt)
+    result = read_reminders(io.StringIO(out.getvalue()), f"pack.{fmt}")
+    assert [notif.key() for notif in result.entries] == [notif.key() for notif in notifications]
+    assert result.errors == []
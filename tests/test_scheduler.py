@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from productivity_timer.engine import TimerEngine
+from productivity_timer.scheduler import TickScheduler
+from productivity_timer.simulation import VirtualClock
+
+def ideal_ends(work, brk, count):
+    ends, at = [], 0
+    for index in range(count):
+        at += work if index % 2 == 0 else brk
+        ends.append(at)
+    return ends
+
+def period_ends(engine, clock, hours, lateness):
+    # Times periods completed at, with every tick lateness() seconds late
+    ends = []
+    engine.add_listener(lambda event, info: event == "period_complete" and ends.append(clock()))
+    engine.start()
+    while clock() < hours * 3600:
+        clock.advance(engine.next_delay() + lateness())
+        engine.tick()
+    return ends
+
+def test_countdown_catches_up_after_late_ticks():
+    clock = VirtualClock()
+    scheduler = TickScheduler(60, clock=clock)
+    clock.advance(10.7)
+    assert scheduler.remaining_seconds() == 50
+    clock.advance(49.3)
+    assert scheduler.expired()
+
+def test_period_ends_stay_within_tick_lateness():
+    clock = VirtualClock()
+    engine = TimerEngine(600, 120, clock=clock, wall_clock=clock.wall, resolution=0.5)
+    rng = random.Random(1)
+    ends = period_ends(engine, clock, 6, lambda: rng.uniform(0, 0.3))
+    assert len(ends) == 60
+    for actual, ideal in zip(ends, ideal_ends(600, 120, len(ends))):
+        assert 0 <= actual - ideal <= 0.3 + 1e-9
+
+def test_stalls_do_not_add_up_over_hours():
+    # Stalls of a few seconds delay the tick that sees a period end, never
+    # the periods after it
+    for seed in range(5):
+        clock = VirtualClock()
+        engine = TimerEngine(1500, 300, clock=clock, wall_clock=clock.wall)
+        rng = random.Random(seed)
+        ends = period_ends(engine, clock, 8, lambda: rng.uniform(2, 4) if rng.random() < 0.05
+                           else rng.uniform(0, 0.3))
+        assert len(ends) == 32
+        for actual, ideal in zip(ends, ideal_ends(1500, 300, len(ends))):
+            assert 0 <= actual - ideal <= 4 + 1e-9
+
+def test_periods_too_short_to_count_down_are_refused():
+    with pytest.raises(ValueError):
+        TickScheduler(1e-10)
+    for seconds in (1e-10, 0.5, 0, float("nan")):
+        engine = TimerEngine(seconds, 60, clock=VirtualClock())
+        with pytest.raises(ValueError):
+            engine.start()
+        assert not engine.running
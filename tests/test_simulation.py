@@ -0,0 +1,78 @@
+from productivity_timer.reminders import parse_reminder_spec
+from productivity_timer.simulation import VirtualClock, format_offset, simulate
+
+DAY = 86400
+WORK = 3600
+BREAK = 900
+CYCLE = WORK + BREAK
+
+def day_trace(*specs, **kwargs):
+    return simulate(WORK, BREAK, [parse_reminder_spec(spec) for spec in specs], DAY, **kwargs)
+
+def times(trace, event, detail=""):
+    return [item.at for item in trace if item.event == event and detail in item.detail]
+
+def in_work(at):
+    # A reminder due exactly as a period ends belongs to the period ending
+    return 0 < at % CYCLE <= WORK
+
+def test_period_transitions():
+    trace = day_trace()
+    work_starts = list(range(0, DAY, CYCLE))
+    break_starts = [start + WORK for start in work_starts if start + WORK < DAY]
+    assert times(trace, "period_start", "work") == work_starts
+    assert times(trace, "period_start", "break") == break_starts
+    assert times(trace, "period_complete", "work") == break_starts
+    assert times(trace, "period_complete", "break") == work_starts[1:]
+    assert trace[-1].event == "stop" and trace[-1].at == DAY
+
+def test_period_reminders():
+    trace = day_trace("50:Half", "12.5:Eighth", "+10m:Ten", "+5m during break:Walk",
+                      "100:End")
+    def every_cycle(offset):
+        return [start + offset for start in range(0, DAY, CYCLE) if start + offset < DAY]
+    assert times(trace, "reminder", "'Half'") == every_cycle(1800)
+    assert times(trace, "reminder", "'Eighth'") == every_cycle(450)
+    assert times(trace, "reminder", "'Ten'") == every_cycle(600)
+    assert times(trace, "reminder", "'Walk'") == every_cycle(WORK + 300)
+    assert times(trace, "reminder", "'End'") == every_cycle(WORK)
+
+def test_recurring_reminders():
+    trace = day_trace("every 25m:Eyes", "every 7m during work:Posture",
+                      "every 4m during break:Stretch")
+    assert times(trace, "reminder", "'Eyes'") == list(range(1500, DAY, 1500))
+    assert times(trace, "reminder", "'Posture'") == [at for at in range(420, DAY, 420)
+                                                     if in_work(at)]
+    assert times(trace, "reminder", "'Stretch'") == [at for at in range(240, DAY, 240)
+                                                     if not in_work(at)]
+
+def test_time_of_day_reminders():
+    # The virtual wall clock starts at local midnight
+    trace = day_trace("@12:30:Lunch", "@14:50 during break:Walk", "@14:00 during break:Never",
+                      "@00:00:Midnight")
+    assert times(trace, "reminder", "'Lunch'") == [12 * 3600 + 1800]
+    assert times(trace, "reminder", "'Walk'") == [14 * 3600 + 3000]
+    assert times(trace, "reminder", "'Never'") == []
+    # Midnight comes round again only as the day ends
+    assert times(trace, "reminder", "'Midnight'") == [DAY]
+
+def test_reminders_fire_on_time_at_any_resolution():
+    # Traces print times to the millisecond
+    reminders = [parse_reminder_spec(spec) for spec in
+                 ("33.3:Third", "+7m13s:Odd", "every 17m:Repeat", "@02:41:Clock")]
+    expected = [str(item) for item in simulate(WORK, BREAK, reminders, 4 * 3600)]
+    for resolution in (1.0, 0.25, "adaptive"):
+        trace = simulate(WORK, BREAK, reminders, 4 * 3600, resolution=resolution, ticks=True)
+        assert [str(item) for item in trace if item.event != "tick"] == expected
+        assert all(item.detail.endswith("late 0.000s") for item in trace
+                   if item.event == "reminder")
+
+def test_same_arguments_same_trace():
+    specs = ("50:Half", "every 25m:Eyes", "@12:30:Lunch")
+    first = [str(item) for item in day_trace(*specs)]
+    second = [str(item) for item in day_trace(*specs, clock=VirtualClock())]
+    assert first == second
+
+def test_format_offset():
+    assert format_offset(0) == "0d 00:00:00.000"
+    assert format_offset(93784.5) == "1d 02:03:04.500"
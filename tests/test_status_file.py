@@ -0,0 +1,83 @@
+import pytest
+
+from productivity_timer.engine import TimerEngine
+from productivity_timer.reminders import parse_reminder_spec
+from productivity_timer.simulation import VirtualClock
+from productivity_timer.status_file import (_SEQUENCE, MESSAGE_SIZE, StatusExport,
+                                            StatusReader)
+
+def exported(tmp_path, reminders=("+10m:Stand up",)):
+    clock = VirtualClock()
+    engine = TimerEngine(3600, 900, clock=clock, wall_clock=clock.wall)
+    engine.set_reminders([parse_reminder_spec(spec) for spec in reminders])
+    export = StatusExport(engine, str(tmp_path / "status"))
+    engine.add_listener(export)
+    return engine, clock, export, StatusReader(export.path)
+
+def test_idle_before_the_first_start(tmp_path):
+    _, _, _, reader = exported(tmp_path)
+    status = reader.read()
+    assert status["mode"] == "idle"
+    assert not status["running"] and not status["paused"]
+    assert status["next_reminder"] is None and status["ends_at"] is None
+
+def test_running(tmp_path):
+    engine, clock, _, reader = exported(tmp_path)
+    engine.start()
+    clock.advance(900)
+    engine.tick()
+    status = reader.read()
+    assert status["mode"] == "work" and status["running"]
+    assert (status["remaining"], status["total"], status["progress"]) == (2700, 3600, 25.0)
+    # +10m is past, nothing else is due this period
+    assert status["next_reminder"] is None and status["next_reminder_in"] is None
+    assert status["ends_at"] == pytest.approx(status["updated"] + 2700)
+
+def test_paused_and_stopped(tmp_path):
+    engine, clock, _, reader = exported(tmp_path)
+    engine.start()
+    clock.advance(300)
+    engine.tick()
+    engine.pause()
+    status = reader.read()
+    assert status["mode"] == "work" and status["paused"] and not status["running"]
+    assert (status["remaining"], status["total"]) == (3300, 3600)
+    assert status["progress"] == pytest.approx(300 / 36)
+    assert status["ends_at"] is None
+    engine.stop()
+    status = reader.read()
+    assert status["mode"] == "work" and not status["paused"] and not status["running"]
+    assert status["remaining"] == 3300
+
+def test_next_reminder_and_close(tmp_path):
+    engine, clock, export, reader = exported(tmp_path)
+    engine.start()
+    status = reader.read()
+    assert status["next_reminder"] == "Stand up"
+    assert status["next_reminder_in"] == 600
+    export.close()
+    assert reader.read()["mode"] == "idle"
+
+def test_long_utf8_message_is_cut_at_a_character(tmp_path):
+    # Two-byte characters starting at an odd offset straddle the 128 byte limit
+    message = "x" + "é" * 100
+    engine, _, _, reader = exported(tmp_path, [f"+10m:{message}"])
+    engine.start()
+    text = reader.read()["next_reminder"]
+    assert message.startswith(text)
+    assert len(text.encode("utf-8")) == MESSAGE_SIZE - 1
+
+def test_reader_waits_out_a_write_in_progress(tmp_path):
+    engine, _, export, reader = exported(tmp_path)
+    engine.start()
+    # What a reader sees while the writer is between its two counter updates
+    export.map[4:12] = _SEQUENCE.pack(export.sequence + 1)
+    assert reader.read(retries=5) is None
+    export.map[4:12] = _SEQUENCE.pack(export.sequence)
+    assert reader.read()["mode"] == "work"
+
+def test_other_files_are_refused(tmp_path):
+    path = tmp_path / "other"
+    path.write_bytes(b"\0" * 200)
+    with pytest.raises(ValueError):
+        StatusReader(str(path))
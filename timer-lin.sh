@@ -5,7 +5,7 @@
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 APP_NAME="productivity-timer"
-PYTHON_SCRIPT="portable_productivity_timer.py"
+PYTHON_SCRIPT="timer.py"
 
 # Check if Python 3 is installed
 if ! command -v python3 &> /dev/null; then